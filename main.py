@@ -5,7 +5,6 @@ Excel Search MCP Server 실행 스크립트
 이 스크립트를 통해 MCP 서버를 실행할 수 있습니다.
 """
 
-import asyncio
 import sys
 from pathlib import Path
 
@@ -13,11 +12,11 @@ from pathlib import Path
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
-from src.server import main
+from src.server import run_server
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        run_server()
     except KeyboardInterrupt:
         print("\n서버가 사용자에 의해 중단되었습니다.")
         sys.exit(0)
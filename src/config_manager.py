@@ -4,27 +4,52 @@ Configuration Manager Module
 MCP 서버의 설정을 관리하는 모듈
 """
 
+import copy
+import functools
 import json
 import logging
-from pathlib import Path
-from typing import List, Dict, Any
+import os
+from typing import List, Dict, Any, FrozenSet, Optional
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+# 홈 디렉토리는 한 번만 계산합니다.
+_HOME = os.path.expanduser("~")
+
+
+@functools.lru_cache(maxsize=8)
+def _load_config_file(path: str, mtime_ns: int) -> Dict[str, Any]:
+    """설정 파일을 파싱합니다. (경로, 수정 시각) 기준으로 캐시됩니다."""
+    with open(path, "rb") as f:
+        data = f.read()
+
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data.decode("utf-8"))
+
 
 class ConfigManager:
     """설정 관리 클래스"""
 
     def __init__(self, config_path: str = "config.json"):
-        self.config_path = Path(config_path)
+        self.config_path = config_path
         self.config = self._load_config()
+        self._refresh_cached_values()
 
     def _load_config(self) -> Dict[str, Any]:
         """설정 파일을 로드합니다."""
         try:
-            if self.config_path.exists():
-                with open(self.config_path, "r", encoding="utf-8") as f:
-                    config = json.load(f)
+            if os.path.exists(self.config_path):
+                mtime_ns = os.stat(self.config_path).st_mtime_ns
+                # 캐시된 dict 를 공유하지 않도록 복사본을 사용합니다.
+                config = copy.deepcopy(
+                    _load_config_file(os.path.abspath(self.config_path), mtime_ns)
+                )
                 logger.info(f"설정 파일 로드됨: {self.config_path}")
                 return config
             else:
@@ -44,9 +69,9 @@ class ConfigManager:
             },
             "security": {
                 "allowed_directories": [
-                    str(Path.home() / "Documents"),
-                    str(Path.home() / "Desktop"),
-                    str(Path.home() / "Downloads"),
+                    os.path.join(_HOME, "Documents"),
+                    os.path.join(_HOME, "Desktop"),
+                    os.path.join(_HOME, "Downloads"),
                 ],
                 "allow_subdirectories": True,
                 "max_search_depth": 10,
@@ -58,55 +83,104 @@ class ConfigManager:
             },
         }
 
+    def _refresh_cached_values(self) -> None:
+        """자주 조회되는 설정 값을 미리 계산해 둡니다."""
+        excel_config = self.config.get("excel", {})
+
+        self._work_directory = self.config.get(
+            "work_directory", os.path.join(_HOME, "Documents")
+        )
+        self._supported_extensions = tuple(
+            excel_config.get(
+                "supported_extensions", [".xlsx", ".xls", ".xlsm", ".xlsb"]
+            )
+        )
+        self._supported_extension_set = frozenset(
+            ext.lower() for ext in self._supported_extensions
+        )
+        self._max_file_size_mb = excel_config.get("max_file_size_mb", 100)
+        self._max_files_per_search = excel_config.get("max_files_per_search", 1000)
+        self._recursive_search = excel_config.get("recursive_search", True)
+        server_config = self.config.get("server", {})
+        self._debug = bool(server_config.get("debug", False))
+        self._pretty_json = bool(server_config.get("pretty_json", False))
+        self._structured_content = bool(server_config.get("structured_content", False))
+        summary_cache_dir = self.config.get("cache", {}).get("summary_directory")
+        self._summary_cache_dir = (
+            os.path.expanduser(summary_cache_dir) if summary_cache_dir else None
+        )
+
+        # 경로 검증 시마다 작업 디렉토리를 다시 resolve 하지 않도록 캐시
+        self._work_dir_resolved = os.path.normcase(
+            os.path.realpath(self._work_directory)
+        )
+        # 하위 경로 판별용 접두사 (루트 디렉토리도 구분자가 중복되지 않음)
+        self._work_dir_prefix = os.path.join(self._work_dir_resolved, "")
+
     def get_work_directory(self) -> str:
         """작업 디렉토리를 반환합니다."""
-        return self.config.get("work_directory", str(Path.home() / "Documents"))
+        return self._work_directory
 
     def get_supported_extensions(self) -> List[str]:
         """지원하는 Excel 확장자를 반환합니다."""
-        return self.config.get("excel", {}).get(
-            "supported_extensions", [".xlsx", ".xls", ".xlsm", ".xlsb"]
-        )
+        return list(self._supported_extensions)
+
+    def get_supported_extension_set(self) -> FrozenSet[str]:
+        """확장자 포함 여부 검사용 집합을 반환합니다."""
+        return self._supported_extension_set
 
     def get_max_file_size_mb(self) -> int:
         """최대 파일 크기(MB)를 반환합니다."""
-        return self.config.get("excel", {}).get("max_file_size_mb", 100)
+        return self._max_file_size_mb
 
     def get_max_files_per_search(self) -> int:
         """검색당 최대 파일 수를 반환합니다."""
-        return self.config.get("excel", {}).get("max_files_per_search", 1000)
+        return self._max_files_per_search
 
     def get_recursive_search(self) -> bool:
         """재귀 검색 여부를 반환합니다."""
-        return self.config.get("excel", {}).get("recursive_search", True)
+        return self._recursive_search
+
+    def get_debug(self) -> bool:
+        """디버그용 도구 노출 여부를 반환합니다."""
+        return self._debug
+
+    def get_pretty_json(self) -> bool:
+        """도구 응답 JSON 의 들여쓰기 여부를 반환합니다."""
+        return self._pretty_json
+
+    def get_structured_content(self) -> bool:
+        """도구 결과를 structuredContent 로 반환할지 여부를 반환합니다."""
+        return self._structured_content
+
+    def get_summary_cache_dir(self) -> Optional[str]:
+        """시트 요약 디스크 캐시 디렉토리를 반환합니다. (미설정 시 None)"""
+        return self._summary_cache_dir
 
     def is_path_within_work_directory(self, path: str) -> bool:
         """경로가 작업 디렉토리 내에 있는지 확인합니다."""
         try:
-            target_path = Path(path).resolve()
-            work_dir = Path(self.get_work_directory()).resolve()
-
-            # 정확히 일치하는 경우
-            if target_path == work_dir:
-                return True
-
-            # 하위 디렉토리인 경우
-            try:
-                target_path.relative_to(work_dir)
-                return True
-            except ValueError:
-                # 상위 디렉토리임
-                return False
+            return self.is_real_path_within_work_directory(os.path.realpath(path))
 
         except Exception as e:
             logger.error(f"경로 검증 중 오류 발생: {path} - {e}")
             return False
 
+    def is_real_path_within_work_directory(self, real_path: str) -> bool:
+        """이미 realpath 로 정규화된 경로를 추가 시스템 호출 없이 검사합니다."""
+        target_path = os.path.normcase(real_path)
+
+        # 정확히 일치하거나 하위 디렉토리인 경우
+        return target_path == self._work_dir_resolved or target_path.startswith(
+            self._work_dir_prefix
+        )
+
     def _save_config(self) -> bool:
         """설정을 파일에 저장합니다."""
         try:
             with open(self.config_path, "w", encoding="utf-8") as f:
                 json.dump(self.config, f, indent=2, ensure_ascii=False)
+            self._refresh_cached_values()
             logger.info(f"설정 파일 저장됨: {self.config_path}")
             return True
         except Exception as e:
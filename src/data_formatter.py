@@ -4,33 +4,224 @@ Data Formatter Module
 Module for converting and formatting Excel data to JSON format
 """
 
+import functools
+import importlib.util
 import json
 import logging
+import math
+import operator
+import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Any, Optional
-from datetime import datetime, date
+from datetime import datetime, date, time, timezone
 import pandas as pd
 import numpy as np
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Prefer the Rust-based calamine reader when python-calamine is installed
+EXCEL_ENGINE = (
+    "calamine"
+    if importlib.util.find_spec("python_calamine") is not None
+    else "openpyxl"
+)
+
+# Format used for datetime columns (matches datetime.isoformat() output)
+ISO_DATETIME_FORMAT = "%Y-%m-%dT%H:%M:%S"
+
+# Upper bound on threads used to format several files at once
+MAX_FORMAT_WORKERS = 8
+
+# Reads of at most this many rows (previews) are memoized per file version
+PREVIEW_MAX_ROWS = 200
+
+# Full sheet reads (and their string forms for searching) kept in memory;
+# each may hold a whole worksheet, so only the most recent few are cached
+SHEET_CACHE_SIZE = 2
+
+# Buffer size for JSON exports (default io buffer is only 8 KB)
+JSON_WRITE_BUFFER_SIZE = 1024 * 1024
+
+
+class _CountingWriter:
+    """Text writer that encodes to a binary file and counts bytes written"""
+
+    def __init__(self, raw: Any):
+        self.raw = raw
+        self.bytes_written = 0
+
+    def write(self, text: str) -> int:
+        self.bytes_written += self.raw.write(text.encode("utf-8"))
+        return len(text)
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _float_value(value: float) -> Optional[float]:
+    # NaN is the only value that is not equal to itself
+    return None if value != value else value
+
+
+def _numpy_float_value(value: np.floating) -> Optional[float]:
+    return _float_value(value.item())
+
+
+def _numpy_int_value(value: np.integer) -> int:
+    return value.item()
+
+
+_isoformat = operator.methodcaller("isoformat")
+
+
+def _datetime64_value(value: np.datetime64) -> Optional[str]:
+    return None if np.isnat(value) else pd.Timestamp(value).isoformat()
+
+
+def _tolist(value: np.ndarray) -> List[Any]:
+    return value.tolist()
+
+
+@functools.lru_cache(maxsize=4096)
+def _format_epoch_seconds(seconds: int) -> str:
+    return datetime.fromtimestamp(seconds, tz=timezone.utc).strftime(
+        ISO_DATETIME_FORMAT + "Z"
+    )
+
+
+def format_timestamp(timestamp: float) -> str:
+    """Format a POSIX timestamp as a UTC ISO 8601 string ending in "Z"
+
+    Precision is whole seconds; files sharing an mtime hit the cache.
+    """
+    return _format_epoch_seconds(int(timestamp))
+
+
+def read_sheet_fast(
+    file_path: Any, sheet_name: Any = 0, nrows: Optional[int] = None
+) -> pd.DataFrame:
+    """Read one worksheet with the fastest reader that can parse the file
+
+    calamine is tried first when installed (it covers xlsx, xlsm, xlsb and
+    xls); otherwise, or if it rejects the file, pandas picks its default
+    engine for the extension (openpyxl for xlsx/xlsm).
+    """
+    if EXCEL_ENGINE == "calamine":
+        try:
+            return pd.read_excel(
+                file_path, sheet_name=sheet_name, engine="calamine", nrows=nrows
+            )
+        except Exception as e:
+            logger.debug(f"calamine could not read {file_path}, falling back: {e}")
+    return pd.read_excel(file_path, sheet_name=sheet_name, nrows=nrows)
+
+
+@functools.lru_cache(maxsize=64)
+def _read_excel_cached(
+    file_path: str,
+    worksheet_name: Any,
+    nrows: Optional[int],
+    mtime_ns: int,
+    file_size: int,
+) -> pd.DataFrame:
+    # mtime_ns and file_size are only part of the key so edits invalidate it
+    return read_sheet_fast(file_path, worksheet_name, nrows)
+
+
+@functools.lru_cache(maxsize=SHEET_CACHE_SIZE)
+def _read_sheet_full_cached(
+    file_path: str,
+    worksheet_name: Any,
+    nrows: Optional[int],
+    mtime_ns: int,
+    file_size: int,
+) -> pd.DataFrame:
+    # Same key as _read_excel_cached, for reads larger than a preview
+    return read_sheet_fast(file_path, worksheet_name, nrows)
+
+
+def read_sheet_cached(
+    file_path: Any, sheet_name: Any = 0, nrows: Optional[int] = None
+) -> pd.DataFrame:
+    """read_sheet_fast memoized per (path, sheet, nrows, mtime, size)
+
+    Previews (nrows <= PREVIEW_MAX_ROWS) share a larger cache; full and
+    larger reads may each hold a whole worksheet, so only the
+    SHEET_CACHE_SIZE most recent are kept. The returned DataFrame is
+    shared and must not be modified in place.
+    """
+    stat = os.stat(file_path)
+    cached = (
+        _read_excel_cached
+        if nrows and nrows <= PREVIEW_MAX_ROWS
+        else _read_sheet_full_cached
+    )
+    return cached(
+        os.path.abspath(file_path),
+        sheet_name,
+        nrows or None,
+        stat.st_mtime_ns,
+        stat.st_size,
+    )
+
 
 class DataFormatter:
     """Data formatting class"""
 
+    DATE_FORMATS = (
+        "%Y-%m-%d",
+        "%Y-%m-%d %H:%M:%S",
+        "%Y-%m-%d %H:%M:%S.%f",
+        "%d/%m/%Y",
+        "%m/%d/%Y",
+        "%Y-%m-%dT%H:%M:%S",
+        "%Y-%m-%dT%H:%M:%SZ",
+    )
+
+    # Exact type -> converter, checked before the isinstance fallback
+    _TYPE_DISPATCH: Dict[type, Any] = {
+        str: _identity,
+        int: _identity,
+        bool: _identity,
+        float: _float_value,
+        datetime: _isoformat,
+        date: _isoformat,
+        time: _isoformat,
+        np.int64: _numpy_int_value,
+        np.float64: _numpy_float_value,
+        pd.Timestamp: _isoformat,
+        np.datetime64: _datetime64_value,
+        np.ndarray: _tolist,
+    }
+
     def __init__(self):
-        self.date_formats = [
-            "%Y-%m-%d",
-            "%Y-%m-%d %H:%M:%S",
-            "%Y-%m-%d %H:%M:%S.%f",
-            "%d/%m/%Y",
-            "%m/%d/%Y",
-            "%Y-%m-%dT%H:%M:%S",
-            "%Y-%m-%dT%H:%M:%SZ",
-        ]
+        self.date_formats = self.DATE_FORMATS
 
     def format_value(self, value: Any) -> Any:
         """Convert single value to JSON serializable format"""
-        if value is None or pd.isna(value):
+        if value is None:
+            return None
+
+        # Plain Python scalars are the bulk of cell values
+        value_type = type(value)
+        if value_type is str or value_type is int or value_type is bool:
+            return value
+        if value_type is float:
+            # NaN check without pandas
+            return None if value != value else value
+
+        handler = self._TYPE_DISPATCH.get(value_type)
+        if handler is not None:
+            return handler(value)
+
+        # Subclasses and less common types
+        if pd.isna(value):
             return None
 
         # Handle numpy types
@@ -38,7 +229,7 @@ class DataFormatter:
             return value.item()
 
         # Handle datetime
-        if isinstance(value, (datetime, date)):
+        if isinstance(value, (datetime, date, time)):
             return value.isoformat()
 
         # Handle pandas Timestamp
@@ -63,38 +254,74 @@ class DataFormatter:
         except Exception:
             return None
 
+    def format_series(self, series: pd.Series) -> List[Any]:
+        """Convert a single column to a list of JSON serializable values"""
+        notna = series.notna()
+
+        # Datetime columns are formatted by pandas in C loops, matching
+        # Timestamp.isoformat(): microseconds only where non-zero
+        if pd.api.types.is_datetime64_any_dtype(series):
+            dt = series.dt
+            if dt.tz is not None or (dt.nanosecond != 0).any():
+                # UTC offsets and nanoseconds are left to isoformat()
+                return [
+                    None if value is pd.NaT else value.isoformat()
+                    for value in series.tolist()
+                ]
+            text = dt.strftime(ISO_DATETIME_FORMAT)
+            fractional = dt.microsecond != 0
+            if fractional.any():
+                text = text.where(~fractional, dt.strftime(ISO_DATETIME_FORMAT + ".%f"))
+            return text.astype(object).where(notna, None).tolist()
+
+        # Numeric, bool and string columns already yield native Python scalars
+        if pd.api.types.is_numeric_dtype(series) or pd.api.types.is_string_dtype(
+            series
+        ):
+            return series.astype(object).where(notna, None).tolist()
+
+        # Mixed object columns still need per-value conversion
+        format_value = self.format_value
+        return [format_value(val) for val in series.tolist()]
+
     def format_dataframe(
-        self, df: pd.DataFrame, include_headers: bool = True
+        self, df: pd.DataFrame, include_headers: bool = True, columnar: bool = False
     ) -> Dict[str, Any]:
-        """Convert DataFrame to JSON serializable dictionary"""
+        """Convert DataFrame to JSON serializable dictionary
+
+        With columnar=True the values are returned as one list per column
+        (parallel to "headers", so duplicate headers keep their own column)
+        under "columns" instead of row lists under "rows".
+        """
         try:
-            # Convert NaN values to None
-            df_clean = df.where(pd.notnull(df), None)
+            # Convert column by column (format_series maps NaN to None)
+            columns = [self.format_series(df.iloc[:, i]) for i in range(df.shape[1])]
 
             if include_headers:
                 # Use column names as headers
-                headers = [str(col) for col in df_clean.columns]
-                rows = []
-
-                for _, row in df_clean.iterrows():
-                    formatted_row = [self.format_value(val) for val in row]
-                    rows.append(formatted_row)
+                headers = [str(col) for col in df.columns]
             else:
                 # Include index and columns
-                headers = ["Index"] + [str(col) for col in df_clean.columns]
-                rows = []
-
-                for idx, row in df_clean.iterrows():
-                    formatted_row = [self.format_value(idx)] + [
-                        self.format_value(val) for val in row
-                    ]
-                    rows.append(formatted_row)
+                headers = ["Index"] + [str(col) for col in df.columns]
+                columns.insert(0, self.format_series(df.index.to_series()))
 
             # Collect data type information
-            data_types = {}
-            for col in df_clean.columns:
-                dtype = str(df_clean[col].dtype)
-                data_types[str(col)] = dtype
+            data_types = {str(col): str(dtype) for col, dtype in df.dtypes.items()}
+
+            if columnar:
+                return {
+                    "headers": headers,
+                    "columns": columns,
+                    "row_count": len(df),
+                    "column_count": len(headers),
+                    "data_types": data_types,
+                }
+
+            # Transpose the column lists into rows
+            if columns:
+                rows = [list(row) for row in zip(*columns)]
+            else:
+                rows = [[] for _ in range(len(df))]
 
             return {
                 "headers": headers,
@@ -115,6 +342,65 @@ class DataFormatter:
                 "error": str(e),
             }
 
+    def format_dataframe_arrow(
+        self, df: pd.DataFrame, include_headers: bool = True
+    ) -> Any:
+        """Convert DataFrame to a columnar pyarrow Table"""
+        try:
+            import pyarrow as pa
+        except ImportError as e:
+            raise ImportError(
+                "pyarrow is required for Arrow output "
+                "(pip install excel-search-mcp[arrow])"
+            ) from e
+
+        columns = [df.iloc[:, i] for i in range(df.shape[1])]
+        names = [str(col) for col in df.columns]
+        if not include_headers:
+            # Include index as the first column
+            columns.insert(0, df.index.to_series())
+            names.insert(0, "Index")
+
+        arrays = []
+        for series in columns:
+            try:
+                # Zero-copy for numeric columns without missing values
+                arrays.append(pa.array(series, from_pandas=True))
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                # Mixed object columns are carried as strings
+                values = self.format_series(series)
+                arrays.append(
+                    pa.array(
+                        [None if val is None else str(val) for val in values],
+                        type=pa.string(),
+                    )
+                )
+
+        return pa.Table.from_arrays(arrays, names=names)
+
+    def read_dataframe(
+        self,
+        file_path: str,
+        worksheet_name: Optional[str] = None,
+        nrows: Optional[int] = None,
+    ) -> pd.DataFrame:
+        """Read a worksheet into a DataFrame, reading at most nrows rows
+
+        Results are cached per (path, worksheet, nrows, mtime, size), so the
+        returned DataFrame is shared and must not be modified in place.
+        """
+        return read_sheet_cached(file_path, worksheet_name or 0, nrows)
+
+    def clear_cache(self) -> None:
+        """Clear the cached worksheet reads"""
+        _read_excel_cached.cache_clear()
+        _read_sheet_full_cached.cache_clear()
+
+    def drop_empty(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Remove empty rows and columns using a single notna() mask"""
+        mask = df.notna()
+        return df.loc[mask.any(axis=1), mask.any(axis=0)]
+
     def format_excel_data(
         self,
         file_path: str,
@@ -122,28 +408,34 @@ class DataFormatter:
         max_rows: Optional[int] = None,
         include_headers: bool = True,
         data_only: bool = True,
+        columnar: bool = False,
     ) -> Dict[str, Any]:
         """Convert Excel file data to formatted JSON"""
         try:
-            # Read Excel file using pandas
-            if worksheet_name:
-                df = pd.read_excel(
-                    file_path, sheet_name=worksheet_name, engine="openpyxl"
-                )
-            else:
-                df = pd.read_excel(file_path, sheet_name=0, engine="openpyxl")
+            # Only read the rows that can be returned
+            raw_df = self.read_dataframe(file_path, worksheet_name, nrows=max_rows)
 
             # Decide whether to include only data
-            if data_only:
-                # Remove empty rows and columns
-                df = df.dropna(how="all").dropna(axis=1, how="all")
-
-            # Limit number of rows
+            df = self.drop_empty(raw_df) if data_only else raw_df
+
+            # Emptiness within a full-length limited read is not final: a
+            # dropped row leaves room for rows further down, and a dropped
+            # column may hold values below them. Only then decide on the
+            # whole sheet (a short read already holds every row of it)
+            if (
+                data_only
+                and max_rows
+                and len(raw_df) >= max_rows
+                and df.shape != raw_df.shape
+            ):
+                df = self.drop_empty(self.read_dataframe(file_path, worksheet_name))
+
+            # Limit number of rows (positional slice, no copy)
             if max_rows and len(df) > max_rows:
-                df = df.head(max_rows)
+                df = df.iloc[:max_rows]
 
             # Format data
-            formatted_data = self.format_dataframe(df, include_headers)
+            formatted_data = self.format_dataframe(df, include_headers, columnar)
 
             return {
                 "success": True,
@@ -153,6 +445,7 @@ class DataFormatter:
                 "max_rows_applied": max_rows,
                 "include_headers": include_headers,
                 "data_only": data_only,
+                "columnar": columnar,
             }
 
         except Exception as e:
@@ -163,55 +456,106 @@ class DataFormatter:
                 "file_path": file_path,
             }
 
+    def format_many(self, file_paths: List[str], **kwargs: Any) -> List[Dict[str, Any]]:
+        """Format several Excel files concurrently, keeping the input order
+
+        Keyword arguments are passed through to format_excel_data.
+        """
+        if not file_paths:
+            return []
+
+        max_workers = min(MAX_FORMAT_WORKERS, len(file_paths))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(
+                executor.map(
+                    lambda path: self.format_excel_data(path, **kwargs), file_paths
+                )
+            )
+
     def create_summary_stats(self, df: pd.DataFrame) -> Dict[str, Any]:
         """Generate statistical summary information for DataFrame"""
         try:
             stats = {}
 
             # Basic information
-            stats["total_rows"] = len(df)
+            total_rows = len(df)
+            stats["total_rows"] = total_rows
             stats["total_columns"] = len(df.columns)
 
+            # Column-wide aggregates computed once for the whole frame
+            null_counts = df.isna().sum()
+            unique_counts = df.nunique()
+            dtypes = df.dtypes
+
+            numeric_columns = [
+                col
+                for col in df.columns
+                if null_counts[col] < total_rows
+                and pd.api.types.is_numeric_dtype(dtypes[col])
+            ]
+            string_columns = [
+                col
+                for col in df.columns
+                if null_counts[col] < total_rows
+                and col not in numeric_columns
+                and pd.api.types.is_string_dtype(df[col].dropna())
+            ]
+
+            numeric_stats = (
+                df[numeric_columns].agg(["min", "max", "mean", "median", "std"])
+                if numeric_columns
+                else None
+            )
+            string_stats = (
+                df[string_columns]
+                .apply(lambda s: s.str.len())
+                .agg(["min", "max", "mean"])
+                if string_columns
+                else None
+            )
+
             # Statistics for each column
             column_stats = {}
             for col in df.columns:
-                col_data = df[col].dropna()
+                null_count = null_counts[col]
 
-                if len(col_data) == 0:
+                if null_count == total_rows:
                     column_stats[col] = {
-                        "data_type": str(df[col].dtype),
-                        "null_count": len(df[col]),
+                        "data_type": str(dtypes[col]),
+                        "null_count": total_rows,
                         "null_percentage": 100.0,
                         "unique_count": 0,
                     }
                     continue
 
                 col_stats = {
-                    "data_type": str(df[col].dtype),
-                    "null_count": df[col].isnull().sum(),
-                    "null_percentage": (df[col].isnull().sum() / len(df)) * 100,
-                    "unique_count": col_data.nunique(),
+                    "data_type": str(dtypes[col]),
+                    "null_count": null_count,
+                    "null_percentage": (null_count / total_rows) * 100,
+                    "unique_count": int(unique_counts[col]),
                 }
 
                 # Additional statistics for numeric data
-                if pd.api.types.is_numeric_dtype(col_data):
+                if numeric_stats is not None and col in numeric_stats:
+                    col_numeric = numeric_stats[col]
                     col_stats.update(
                         {
-                            "min": col_data.min(),
-                            "max": col_data.max(),
-                            "mean": col_data.mean(),
-                            "median": col_data.median(),
-                            "std": col_data.std(),
+                            "min": col_numeric["min"],
+                            "max": col_numeric["max"],
+                            "mean": col_numeric["mean"],
+                            "median": col_numeric["median"],
+                            "std": col_numeric["std"],
                         }
                     )
 
                 # Additional statistics for string data
-                elif pd.api.types.is_string_dtype(col_data):
+                elif string_stats is not None and col in string_stats:
+                    col_lengths = string_stats[col]
                     col_stats.update(
                         {
-                            "min_length": col_data.str.len().min(),
-                            "max_length": col_data.str.len().max(),
-                            "avg_length": col_data.str.len().mean(),
+                            "min_length": int(col_lengths["min"]),
+                            "max_length": int(col_lengths["max"]),
+                            "avg_length": col_lengths["mean"],
                         }
                     )
 
@@ -270,24 +614,56 @@ class DataFormatter:
     ) -> Dict[str, Any]:
         """Export data to JSON file"""
         try:
-            json_str = json.dumps(
-                data, indent=indent, ensure_ascii=ensure_ascii, default=str
-            )
+            # orjson only supports compact or 2-space indented output and
+            # always emits UTF-8; json.dumps(indent=0) still breaks lines
+            use_orjson = orjson is not None and indent in (None, 2) and not ensure_ascii
+            if use_orjson:
+                option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+                if indent:
+                    option |= orjson.OPT_INDENT_2
+            # Compact output has no spaces after separators, as with orjson
+            separators = (",", ":") if indent is None else None
 
             if output_path:
-                with open(output_path, "w", encoding="utf-8") as f:
-                    f.write(json_str)
+                with open(output_path, "wb", buffering=JSON_WRITE_BUFFER_SIZE) as f:
+                    if use_orjson:
+                        file_size = f.write(
+                            orjson.dumps(data, default=json_default, option=option)
+                        )
+                    else:
+                        # Stream into the file instead of building the string
+                        writer = _CountingWriter(f)
+                        json.dump(
+                            replace_non_finite(data),
+                            writer,
+                            indent=indent,
+                            separators=separators,
+                            ensure_ascii=ensure_ascii,
+                            default=json_default,
+                        )
+                        file_size = writer.bytes_written
 
                 return {
                     "success": True,
                     "output_path": output_path,
-                    "file_size": len(json_str.encode("utf-8")),
+                    "file_size": file_size,
                 }
             else:
+                if use_orjson:
+                    json_bytes = orjson.dumps(data, default=json_default, option=option)
+                else:
+                    json_bytes = json.dumps(
+                        replace_non_finite(data),
+                        indent=indent,
+                        separators=separators,
+                        ensure_ascii=ensure_ascii,
+                        default=json_default,
+                    ).encode("utf-8")
+
                 return {
                     "success": True,
-                    "json_data": json_str,
-                    "data_size": len(json_str.encode("utf-8")),
+                    "json_data": json_bytes.decode("utf-8"),
+                    "data_size": len(json_bytes),
                 }
 
         except Exception as e:
@@ -295,6 +671,35 @@ class DataFormatter:
             return {"success": False, "error": str(e)}
 
 
+# Shared formatter instance used by the convenience functions
+_DEFAULT_FORMATTER = DataFormatter()
+
+
+def replace_non_finite(value: Any) -> Any:
+    """Replace NaN and infinite floats with None in nested dicts and lists
+
+    orjson writes such floats as null, while the stdlib encoder would emit
+    the invalid tokens NaN and Infinity, so its input goes through here.
+    """
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {key: replace_non_finite(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [replace_non_finite(item) for item in value]
+    return value
+
+
+def json_default(value: Any) -> Any:
+    """default= hook for values neither JSON encoder handles natively
+
+    Values are converted as in DataFormatter.format_value: numpy scalars
+    become Python numbers, Timestamps ISO 8601 strings, NaN/NaT None and
+    anything else str(), so orjson and json produce the same document.
+    """
+    return replace_non_finite(_DEFAULT_FORMATTER.format_value(value))
+
+
 # Convenience functions
 def format_excel_data(
     file_path: str,
@@ -303,21 +708,18 @@ def format_excel_data(
     include_headers: bool = True,
 ) -> Dict[str, Any]:
     """Convenience function to format Excel data"""
-    formatter = DataFormatter()
-    return formatter.format_excel_data(
+    return _DEFAULT_FORMATTER.format_excel_data(
         file_path, worksheet_name, max_rows, include_headers
     )
 
 
 def create_summary_stats(df: pd.DataFrame) -> Dict[str, Any]:
     """Convenience function to generate DataFrame statistical summary"""
-    formatter = DataFormatter()
-    return formatter.create_summary_stats(df)
+    return _DEFAULT_FORMATTER.create_summary_stats(df)
 
 
 def export_to_json(
     data: Dict[str, Any], output_path: Optional[str] = None
 ) -> Dict[str, Any]:
     """Convenience function to export data to JSON"""
-    formatter = DataFormatter()
-    return formatter.export_to_json(data, output_path)
+    return _DEFAULT_FORMATTER.export_to_json(data, output_path)
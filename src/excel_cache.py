@@ -0,0 +1,120 @@
+"""
+Excel Cache Module
+
+On-disk cache of workbook sheet summaries, shared across server restarts
+"""
+
+import hashlib
+import json
+import logging
+import math
+import os
+import tempfile
+from typing import Any, Dict, Optional, Tuple
+
+from .config_manager import config_manager
+
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# Bump when the layout of cached summaries changes
+CACHE_VERSION = 1
+
+# Value types that survive a JSON round trip unchanged
+_JSON_SCALARS = (str, int, float, bool, type(None))
+
+
+def _cache_file(cache_dir: str, file_path: str, mtime_ns: int, file_size: int) -> str:
+    """Cache file of one file version
+
+    The key covers the absolute path, size and mtime, so an edited file
+    gets a new entry instead of reading a stale one.
+    """
+    key = hashlib.blake2b(
+        f"{CACHE_VERSION}|{file_path}|{file_size}|{mtime_ns}".encode("utf-8"),
+        digest_size=16,
+    ).hexdigest()
+    return os.path.join(cache_dir, f"{key}.json")
+
+
+def _is_json_native(worksheets: Tuple[Dict[str, Any], ...]) -> bool:
+    """Whether the summaries can be stored without changing value types
+
+    Header cells may hold dates, times or non-finite numbers, which JSON
+    would turn into strings or nulls; such summaries are not persisted.
+    """
+    return all(
+        isinstance(header, _JSON_SCALARS)
+        and not (isinstance(header, float) and not math.isfinite(header))
+        for worksheet in worksheets
+        for header in worksheet["headers"]
+    )
+
+
+def load_worksheet_summaries(
+    file_path: str, mtime_ns: int, file_size: int
+) -> Optional[Tuple[Dict[str, Any], ...]]:
+    """Cached sheet summaries of a file version, or None on a miss
+
+    Always None when "cache.summary_directory" is not configured.
+    """
+    cache_dir = config_manager.get_summary_cache_dir()
+    if cache_dir is None:
+        return None
+
+    path = _cache_file(cache_dir, file_path, mtime_ns, file_size)
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return None
+    except OSError as e:
+        logger.warning(f"Failed to read summary cache: {path} - {e}")
+        return None
+
+    try:
+        worksheets = orjson.loads(data) if orjson is not None else json.loads(data)
+    except ValueError as e:
+        logger.warning(f"Ignoring corrupt summary cache: {path} - {e}")
+        return None
+    return tuple(worksheets)
+
+
+def store_worksheet_summaries(
+    file_path: str,
+    mtime_ns: int,
+    file_size: int,
+    worksheets: Tuple[Dict[str, Any], ...],
+) -> None:
+    """Persist the sheet summaries of a file version
+
+    The file is written to a temporary name and renamed into place, so
+    concurrent readers never see a partial entry. Failures are logged and
+    otherwise ignored.
+    """
+    cache_dir = config_manager.get_summary_cache_dir()
+    if cache_dir is None or not _is_json_native(worksheets):
+        return
+
+    path = _cache_file(cache_dir, file_path, mtime_ns, file_size)
+    if orjson is not None:
+        data = orjson.dumps(worksheets)
+    else:
+        data = json.dumps(worksheets, ensure_ascii=False).encode("utf-8")
+
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError as e:
+        logger.warning(f"Failed to write summary cache: {path} - {e}")
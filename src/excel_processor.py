@@ -2,98 +2,629 @@
 Excel Processor Module
 
 Module responsible for reading, parsing, and extracting data from Excel files
+
+Workbooks are opened with openpyxl in read-only mode with data_only=True,
+keep_links=False and keep_vba=False. Formula cells therefore yield the value
+cached by Excel on the last save, not the formula string, and external links
+and VBA projects are not loaded.
 """
 
+import contextlib
+import copy
+import functools
+import importlib.util
 import logging
-from pathlib import Path
-from typing import Dict, Any, Optional
+import os
+import posixpath
+import stat as stat_module
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from xml.etree import ElementTree
+from typing import Dict, Any, List, Optional, Tuple, Union
+import numpy as np
 import pandas as pd
 import openpyxl
-from openpyxl.utils import get_column_letter
-from datetime import datetime
+from openpyxl.utils import get_column_letter, range_boundaries
 
 from .config_manager import config_manager
+from .excel_cache import load_worksheet_summaries, store_worksheet_summaries
+from .data_formatter import (
+    EXCEL_ENGINE,
+    SHEET_CACHE_SIZE,
+    DataFormatter,
+    _read_excel_cached,
+    _read_sheet_full_cached,
+    format_timestamp,
+    read_sheet_cached,
+)
 
 logger = logging.getLogger(__name__)
 
+# File paths are accepted as strings or path-like objects (e.g. Path)
+FilePath = Union[str, "os.PathLike[str]"]
+
+# Default cap on the number of matches returned by a single search
+DEFAULT_MAX_MATCHES = 10_000
+
+# Arrow-backed strings give search C-level cast and contains kernels
+SEARCH_STRING_DTYPE = (
+    "string[pyarrow]" if importlib.util.find_spec("pyarrow") is not None else str
+)
+
+# Formats openpyxl cannot open; their sheet sizes come from python-calamine
+CALAMINE_ONLY_EXTENSIONS = (".xls", ".xlsb")
+
+# Leading bytes of the two containers workbooks come in
+ZIP_SIGNATURE = b"PK\x03\x04"  # xlsx, xlsm, xlsb
+OLE_SIGNATURE = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"  # xls (and encrypted files)
+
+# Upper bound on threads used to summarize several files at once
+MAX_SUMMARY_THREADS = 8
+
+
+def _open_workbook(file_path: Any) -> Any:
+    """Open a workbook in read-only, values-only mode (caller must close it)"""
+    return openpyxl.load_workbook(
+        file_path, read_only=True, data_only=True, keep_links=False, keep_vba=False
+    )
+
+
+@functools.lru_cache(maxsize=256)
+def _validate_file_access(
+    file_path: str,
+    mtime_ns: int,
+    file_size: int,
+    work_directory: str,
+    max_size_mb: float,
+) -> Dict[str, Any]:
+    """Work directory and size checks for an existing file
+
+    Cached per (path, mtime, size) and the config values involved, so
+    repeated requests for an unchanged file skip the path resolution.
+    """
+    # Check if file is within work directory (resolved once, reused below)
+    real_path = os.path.realpath(file_path)
+    if not config_manager.is_real_path_within_work_directory(real_path):
+        return {
+            "valid": False,
+            "error": f"File access denied: {file_path}. Work directory: {work_directory}",
+            "error_code": "ACCESS_DENIED",
+            "work_directory": work_directory,
+        }
+
+    # Check file size
+    file_size_mb = file_size / (1024 * 1024)
+    if file_size_mb > max_size_mb:
+        return {
+            "valid": False,
+            "error": f"File too large: {file_size_mb:.2f}MB > {max_size_mb}MB",
+            "error_code": "FILE_TOO_LARGE",
+            "file_size_mb": file_size_mb,
+            "max_size_mb": max_size_mb,
+        }
+
+    return {
+        "valid": True,
+        "file_path": real_path,
+        "allowed": True,
+        "file_size_mb": file_size_mb,
+    }
+
+
+def _summarize_worksheet(worksheet: Any, sheet_name: str, index: int) -> Dict[str, Any]:
+    """Size, used range and headers of one read-only worksheet"""
+    # Sheets without a <dimension> element have to be measured
+    if worksheet.max_row is None or worksheet.max_column is None:
+        worksheet.calculate_dimension(force=True)
+
+    # Worksheet size
+    max_row = worksheet.max_row
+    max_col = worksheet.max_column
+
+    # Check actual data range
+    has_data = False
+    data_range = None
+
+    if max_row > 1 or max_col > 1:
+        has_data = True
+        # Start of the used range, as recorded in the sheet's
+        # <dimension> element (no need to visit every cell)
+        min_row = worksheet.min_row or 1
+        min_col = worksheet.min_column or 1
+
+        if min_row <= max_row and min_col <= max_col:
+            data_range = {
+                "start_row": min_row,
+                "end_row": max_row,
+                "start_column": get_column_letter(min_col),
+                "end_column": get_column_letter(max_col),
+            }
+
+    # Header information from first row (if available)
+    headers = []
+    if max_row > 0:
+        # Read only the first row, as plain values
+        header_row = next(
+            worksheet.iter_rows(min_row=1, max_row=1, values_only=True), ()
+        )
+        headers = [value for value in header_row if value is not None]
+
+    return {
+        "name": sheet_name,
+        "index": index,
+        "row_count": max_row,
+        "column_count": max_col,
+        "has_data": has_data,
+        "data_range": data_range,
+        "headers": headers,
+        "header_count": len(headers),
+    }
+
+
+@functools.lru_cache(maxsize=256)
+def _workbook_summary_cached(
+    file_path: str, mtime_ns: int, file_size: int
+) -> Tuple[Dict[str, Any], ...]:
+    """Per-sheet summaries of a workbook
+
+    Cached per (path, mtime, size); an edited file gets a new key, and the
+    least recently used entries are evicted once the cache is full. When
+    "cache.summary_directory" is configured, summaries are also persisted
+    there and survive restarts.
+    """
+    worksheets = load_worksheet_summaries(file_path, mtime_ns, file_size)
+    if worksheets is None:
+        worksheets = _summarize_workbook(file_path)
+        store_worksheet_summaries(file_path, mtime_ns, file_size, worksheets)
+    return worksheets
+
+
+def _summarize_workbook_calamine(
+    file_path: str,
+) -> Optional[Tuple[Dict[str, Any], ...]]:
+    """Per-sheet summaries of an xls or xlsb workbook, via python-calamine
+
+    openpyxl cannot open these formats at all. Returns None when
+    python-calamine is not installed or rejects the file.
+    """
+    if EXCEL_ENGINE != "calamine" or not file_path.lower().endswith(
+        CALAMINE_ONLY_EXTENSIONS
+    ):
+        return None
+    try:
+        from python_calamine import CalamineWorkbook
+
+        workbook = CalamineWorkbook.from_path(file_path)
+        try:
+            summaries = []
+            for i, sheet_name in enumerate(workbook.sheet_names):
+                sheet = workbook.get_sheet_by_name(sheet_name)
+                start, end = sheet.start, sheet.end
+                # Empty sheets report no range; openpyxl sizes them as A1
+                max_row, max_col = (end[0] + 1, end[1] + 1) if end else (1, 1)
+                has_data = max_row > 1 or max_col > 1
+
+                data_range = None
+                headers = []
+                if end:
+                    if has_data:
+                        data_range = {
+                            "start_row": start[0] + 1,
+                            "end_row": max_row,
+                            "start_column": get_column_letter(start[1] + 1),
+                            "end_column": get_column_letter(max_col),
+                        }
+                    # First row of the sheet (not of the used range), as
+                    # openpyxl reads it; calamine fills empty cells with ""
+                    header_row = next(
+                        iter(sheet.to_python(skip_empty_area=False, nrows=1)), []
+                    )
+                    headers = [value for value in header_row if value != ""]
+
+                summaries.append(
+                    {
+                        "name": sheet_name,
+                        "index": i,
+                        "row_count": max_row,
+                        "column_count": max_col,
+                        "has_data": has_data,
+                        "data_range": data_range,
+                        "headers": headers,
+                        "header_count": len(headers),
+                    }
+                )
+            return tuple(summaries)
+        finally:
+            close = getattr(workbook, "close", None)
+            if close is not None:
+                close()
+    except Exception as e:
+        logger.debug(f"calamine could not summarize {file_path}, falling back: {e}")
+        return None
+
+
+def _summarize_workbook(file_path: str) -> Tuple[Dict[str, Any], ...]:
+    """Parse the per-sheet summaries of a workbook"""
+    worksheets = _summarize_workbook_calamine(file_path)
+    if worksheets is not None:
+        return worksheets
+
+    # Read-only workbooks keep the zip file open until closed
+    with contextlib.closing(_open_workbook(file_path)) as workbook:
+        return tuple(
+            _summarize_worksheet(workbook[sheet_name], sheet_name, i)
+            for i, sheet_name in enumerate(workbook.sheetnames)
+        )
+
+
+def _read_dimension(archive: zipfile.ZipFile, member: str) -> Optional[str]:
+    """The <dimension ref> of a worksheet part, or None if it has none"""
+    with archive.open(member) as stream:
+        for _, element in ElementTree.iterparse(stream, events=("start",)):
+            tag = element.tag.rsplit("}", 1)[-1]
+            if tag == "dimension":
+                return element.get("ref")
+            if tag == "sheetData":
+                # <dimension> always precedes the cell data
+                return None
+    return None
+
+
+@functools.lru_cache(maxsize=256)
+def _package_sheet_sizes_cached(
+    file_path: str, mtime_ns: int, file_size: int
+) -> Optional[Tuple[Dict[str, Any], ...]]:
+    """Sheet names and sizes read straight from an xlsx/xlsm package
+
+    Only xl/workbook.xml, its relationships and the <dimension> element at
+    the top of each sheet part are parsed; no cell data is touched. Returns
+    None when the file is not such a package or a sheet has no dimension,
+    in which case callers fall back to openpyxl.
+    """
+    try:
+        with zipfile.ZipFile(file_path) as archive:
+            targets = {}
+            with archive.open("xl/_rels/workbook.xml.rels") as stream:
+                for _, element in ElementTree.iterparse(stream):
+                    if element.tag.endswith("}Relationship"):
+                        targets[element.get("Id")] = (
+                            element.get("Target", ""),
+                            element.get("Type", ""),
+                        )
+
+            sheets = []
+            with archive.open("xl/workbook.xml") as stream:
+                for _, element in ElementTree.iterparse(stream):
+                    if element.tag.endswith("}sheet"):
+                        relation_id = next(
+                            (v for k, v in element.attrib.items() if k.endswith("}id")),
+                            None,
+                        )
+                        sheets.append((element.get("name"), relation_id))
+
+            sizes = []
+            for i, (sheet_name, relation_id) in enumerate(sheets):
+                target, relation_type = targets.get(relation_id, ("", ""))
+                if not relation_type.endswith("/worksheet"):
+                    return None  # chartsheets etc. are left to openpyxl
+                if target.startswith("/"):
+                    member = target[1:]
+                else:
+                    member = posixpath.normpath(posixpath.join("xl", target))
+
+                ref = _read_dimension(archive, member)
+                if not ref:
+                    return None
+                _, _, max_col, max_row = range_boundaries(ref)
+
+                sizes.append(
+                    {
+                        "name": sheet_name,
+                        "index": i,
+                        "row_count": max_row,
+                        "column_count": max_col,
+                        "has_data": max_row > 1 or max_col > 1,
+                    }
+                )
+            return tuple(sizes)
+
+    except (
+        KeyError,
+        ValueError,
+        TypeError,
+        zipfile.BadZipFile,
+        ElementTree.ParseError,
+    ):
+        return None
+
+
+@functools.lru_cache(maxsize=256)
+def _calamine_sheet_sizes_cached(
+    file_path: str, mtime_ns: int, file_size: int
+) -> Optional[Tuple[Dict[str, Any], ...]]:
+    """Sheet names and sizes of an xls or xlsb workbook, via python-calamine
+
+    openpyxl cannot open these formats at all. Sizes cover the cells that
+    hold values, while the <dimension> of xlsx sheets also includes styled
+    empty cells, so other formats are left to the existing paths. Returns
+    None when python-calamine is not installed or rejects the file.
+    """
+    if EXCEL_ENGINE != "calamine" or not file_path.lower().endswith(
+        CALAMINE_ONLY_EXTENSIONS
+    ):
+        return None
+    try:
+        from python_calamine import CalamineWorkbook
+
+        workbook = CalamineWorkbook.from_path(file_path)
+        try:
+            sizes = []
+            for i, sheet_name in enumerate(workbook.sheet_names):
+                end = workbook.get_sheet_by_name(sheet_name).end
+                # Empty sheets report no range; openpyxl sizes them as A1
+                max_row, max_col = (end[0] + 1, end[1] + 1) if end else (1, 1)
+                sizes.append(
+                    {
+                        "name": sheet_name,
+                        "index": i,
+                        "row_count": max_row,
+                        "column_count": max_col,
+                        "has_data": max_row > 1 or max_col > 1,
+                    }
+                )
+            return tuple(sizes)
+        finally:
+            close = getattr(workbook, "close", None)
+            if close is not None:
+                close()
+    except Exception as e:
+        logger.debug(f"calamine could not size {file_path}, falling back: {e}")
+        return None
+
+
+@functools.lru_cache(maxsize=256)
+def _detect_container(file_path: str, mtime_ns: int, file_size: int) -> Optional[str]:
+    """Container format from the file signature: zip, ole or None"""
+    with open(file_path, "rb") as f:
+        signature = f.read(len(OLE_SIGNATURE))
+    if signature.startswith(ZIP_SIGNATURE):
+        return "zip"
+    if signature == OLE_SIGNATURE:
+        return "ole"
+    return None
+
+
+@functools.lru_cache(maxsize=SHEET_CACHE_SIZE)
+def _search_text_cached(*key: Any) -> pd.DataFrame:
+    """Cells of a full sheet read as strings, keyed like the read itself"""
+    return _read_sheet_full_cached(*key).astype(SEARCH_STRING_DTYPE)
+
+
+@functools.lru_cache(maxsize=SHEET_CACHE_SIZE)
+def _search_lower_cached(*key: Any) -> pd.DataFrame:
+    """Lowercased cell strings, for case-insensitive searches"""
+    return _search_text_cached(*key).apply(lambda column: column.str.lower())
+
+
+class WorkbookHandle:
+    """Workbook structure shared by the calls made for one request
+
+    Sheet names, dimensions and headers are parsed once per file version
+    and served from an LRU cache afterwards, so requests on an unchanged
+    file do not reopen the workbook.
+    """
+
+    def __init__(self, file_path: Any, stat: Optional[os.stat_result] = None):
+        self.file_path = os.path.abspath(file_path)
+        self.stat = stat if stat is not None else os.stat(self.file_path)
+        self._worksheets = None
+
+    @property
+    def worksheets(self) -> Tuple[Dict[str, Any], ...]:
+        """Per-sheet summaries (shared, do not modify)"""
+        if self._worksheets is None:
+            self._worksheets = _workbook_summary_cached(
+                self.file_path, self.stat.st_mtime_ns, self.stat.st_size
+            )
+        return self._worksheets
+
+    @property
+    def sheet_sizes(self) -> Tuple[Dict[str, Any], ...]:
+        """Name, index, row/column count and has_data of each sheet
+
+        Read from the sheets' <dimension> elements when possible, which
+        avoids loading the workbook with openpyxl; xls and xlsb workbooks
+        are measured with python-calamine when it is installed.
+        """
+        if self._worksheets is None:
+            key = (self.file_path, self.stat.st_mtime_ns, self.stat.st_size)
+            sizes = _package_sheet_sizes_cached(*key)
+            if sizes is None:
+                sizes = _calamine_sheet_sizes_cached(*key)
+            if sizes is not None:
+                return sizes
+
+        return tuple(
+            {
+                "name": worksheet["name"],
+                "index": worksheet["index"],
+                "row_count": worksheet["row_count"],
+                "column_count": worksheet["column_count"],
+                "has_data": worksheet["has_data"],
+            }
+            for worksheet in self.worksheets
+        )
+
+    @property
+    def container(self) -> Optional[str]:
+        """Container format of the file: zip, ole or None for neither"""
+        return _detect_container(
+            self.file_path, self.stat.st_mtime_ns, self.stat.st_size
+        )
+
+    @property
+    def sheetnames(self) -> List[str]:
+        return [worksheet["name"] for worksheet in self.worksheets]
+
+    def close(self) -> None:
+        self._worksheets = None
+
+    def __enter__(self) -> "WorkbookHandle":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
 
 class ExcelProcessor:
     """Excel file processing class"""
 
     def __init__(self):
         self.supported_formats = config_manager.get_supported_extensions()
+        self.supported_format_set = config_manager.get_supported_extension_set()
+        # Longest first so that ".xlsx" is tried before a shorter ".xls"
+        self._ext_tuple = tuple(
+            sorted(self.supported_format_set, key=len, reverse=True)
+        )
         self.config_manager = config_manager
+        self.formatter = DataFormatter()
 
-    def is_supported_file(self, file_path: Path) -> bool:
+    def is_supported_file(self, file_path: FilePath) -> bool:
         """Check if the file format is supported"""
-        return file_path.suffix.lower() in self.supported_formats
+        return os.fspath(file_path).lower().endswith(self._ext_tuple)
 
     def is_file_path_within_work_directory(self, file_path: str) -> bool:
         """Check if the file path is within work directory"""
         return self.config_manager.is_path_within_work_directory(file_path)
 
-    def validate_file_path(self, file_path: str) -> Dict[str, Any]:
-        """Validate file path and return validation result"""
-        try:
-            path = Path(file_path)
+    def _sheet_key(
+        self,
+        file_path: FilePath,
+        worksheet_name: Optional[str] = None,
+        max_rows: Optional[int] = None,
+    ) -> Tuple[Any, ...]:
+        """(path, sheet, max_rows, mtime_ns, size) cache key of a sheet read"""
+        stat = os.stat(file_path)
+        return (
+            os.path.abspath(file_path),
+            worksheet_name or 0,
+            max_rows or None,
+            stat.st_mtime_ns,
+            stat.st_size,
+        )
+
+    def _read_sheet(
+        self,
+        file_path: FilePath,
+        worksheet_name: Optional[str] = None,
+        max_rows: Optional[int] = None,
+    ) -> pd.DataFrame:
+        """Read a worksheet into a DataFrame (first sheet if not specified)
+
+        Uses calamine when python-calamine is installed and falls back to
+        the pandas default engine for the format otherwise (for xlsx that
+        is openpyxl, which pandas opens read-only with data_only=True).
+        max_rows is passed to the reader so rows past the limit are never
+        parsed.
+
+        Reads are memoized per file version by read_sheet_cached, so the
+        returned DataFrame is shared and must not be modified in place.
+        """
+        return read_sheet_cached(file_path, worksheet_name or 0, max_rows)
+
+    def _check_container(
+        self, file_path: FilePath, handle: WorkbookHandle
+    ) -> Optional[Dict[str, Any]]:
+        """Error result for files that cannot be read, checked by signature
+
+        Rejects non-workbook content before any parser runs. OLE2 files
+        (legacy xls, or encrypted workbooks) cannot be opened by openpyxl;
+        only xls files are read, with python-calamine when installed.
+        """
+        container = handle.container
+        if container is None:
+            return {
+                "success": False,
+                "error": f"Not an Excel workbook: {file_path}",
+                "error_code": "INVALID_FORMAT",
+                "file_path": os.path.abspath(file_path),
+            }
+        if container == "ole" and (
+            EXCEL_ENGINE != "calamine"
+            or not handle.file_path.lower().endswith(CALAMINE_ONLY_EXTENSIONS)
+        ):
+            return {
+                "success": False,
+                "error": (
+                    f"Legacy or encrypted workbook (OLE2) is not supported: "
+                    f"{file_path}"
+                ),
+                "error_code": "UNSUPPORTED_FORMAT",
+                "file_path": os.path.abspath(file_path),
+            }
+        return None
 
-            # Check if file exists
-            if not path.exists():
-                return {
-                    "valid": False,
-                    "error": f"File does not exist: {file_path}",
-                    "error_code": "FILE_NOT_FOUND",
-                }
+    def _validate_file(
+        self, file_path: str, stat: Optional[os.stat_result] = None
+    ) -> Tuple[Dict[str, Any], Optional[os.stat_result]]:
+        """Validate file path, also returning the stat result when available
+
+        A stat result the caller already holds for file_path is reused
+        instead of calling os.stat again.
+        """
+        try:
+            # Single stat call for existence, type and size
+            if stat is None:
+                try:
+                    stat = os.stat(file_path)
+                except (FileNotFoundError, NotADirectoryError):
+                    return {
+                        "valid": False,
+                        "error": f"File does not exist: {file_path}",
+                        "error_code": "FILE_NOT_FOUND",
+                    }, None
 
             # Check if it's a file
-            if not path.is_file():
+            if not stat_module.S_ISREG(stat.st_mode):
                 return {
                     "valid": False,
                     "error": f"Path is not a file: {file_path}",
                     "error_code": "NOT_A_FILE",
-                }
-
-            # Check if file is within work directory
-            if not self.is_file_path_within_work_directory(file_path):
-                work_dir = self.config_manager.get_work_directory()
-                return {
-                    "valid": False,
-                    "error": f"File access denied: {file_path}. Work directory: {work_dir}",
-                    "error_code": "ACCESS_DENIED",
-                    "work_directory": work_dir,
-                }
-
-            # Check file size
-            max_size_mb = self.config_manager.get_max_file_size_mb()
-            file_size_mb = path.stat().st_size / (1024 * 1024)
-            if file_size_mb > max_size_mb:
-                return {
-                    "valid": False,
-                    "error": f"File too large: {file_size_mb:.2f}MB > {max_size_mb}MB",
-                    "error_code": "FILE_TOO_LARGE",
-                    "file_size_mb": file_size_mb,
-                    "max_size_mb": max_size_mb,
-                }
-
-            return {
-                "valid": True,
-                "file_path": str(path.resolve()),
-                "allowed": True,
-                "file_size_mb": file_size_mb,
-            }
+                }, stat
+
+            validation = _validate_file_access(
+                os.path.abspath(file_path),
+                stat.st_mtime_ns,
+                stat.st_size,
+                self.config_manager.get_work_directory(),
+                self.config_manager.get_max_file_size_mb(),
+            )
+            return dict(validation), stat
 
         except Exception as e:
             return {
                 "valid": False,
                 "error": f"File validation error: {str(e)}",
                 "error_code": "VALIDATION_ERROR",
-            }
+            }, None
 
-    def get_file_info(self, file_path: Path) -> Dict[str, Any]:
-        """Get basic information about the Excel file"""
+    def validate_file_path(self, file_path: str) -> Dict[str, Any]:
+        """Validate file path and return validation result"""
+        return self._validate_file(file_path)[0]
+
+    def get_file_info(
+        self, file_path: FilePath, handle: Optional[WorkbookHandle] = None
+    ) -> Dict[str, Any]:
+        """Get basic information about the Excel file
+
+        When a WorkbookHandle is given, its stat result is reused for
+        validation rather than stat'ing the file a second time.
+        """
         try:
             # Validate file path first
-            validation = self.validate_file_path(str(file_path))
+            validation, stat = self._validate_file(
+                os.fspath(file_path), handle.stat if handle is not None else None
+            )
             if not validation["valid"]:
                 logger.warning(
                     f"File access denied: {file_path} - {validation['error']}"
@@ -103,61 +634,37 @@ class ExcelProcessor:
                     "success": False,
                     "error": validation["error"],
                     "error_code": validation["error_code"],
-                    "file_path": str(file_path),
+                    "file_path": os.fspath(file_path),
                     "work_directory": validation.get("work_directory", ""),
                 }
 
             if not self.is_supported_file(file_path):
+                extension = os.path.splitext(file_path)[1]
                 return {
                     "success": False,
-                    "error": f"Unsupported file format: {file_path.suffix}",
+                    "error": f"Unsupported file format: {extension}",
                     "supported_formats": self.supported_formats,
                 }
 
-            # Get workbook information using openpyxl
-            workbook = openpyxl.load_workbook(file_path, read_only=True)
-
-            worksheets = []
-            for i, sheet_name in enumerate(workbook.sheetnames):
-                worksheet = workbook[sheet_name]
-
-                # Calculate worksheet size
-                max_row = worksheet.max_row
-                max_col = worksheet.max_column
-
-                # Check if there is actual data
-                has_data = False
-                if (
-                    max_row > 1 or max_col > 1
-                ):  # Consider having data even if only headers exist
-                    has_data = True
-
-                worksheets.append(
-                    {
-                        "name": sheet_name,
-                        "index": i,
-                        "row_count": max_row,
-                        "column_count": max_col,
-                        "has_data": has_data,
-                    }
-                )
-
-            workbook.close()
-
-            # File metadata
-            stat = file_path.stat()
+            # Sheet names and sizes (memoized per file version)
+            if handle is None:
+                handle = WorkbookHandle(file_path, stat)
+            error = self._check_container(file_path, handle)
+            if error is not None:
+                return error
+            worksheets = [dict(worksheet) for worksheet in handle.sheet_sizes]
 
+            # File metadata (stat result from validation)
             return {
                 "success": True,
-                "file_path": str(file_path.absolute()),
-                "file_name": file_path.name,
+                "file_path": os.path.abspath(file_path),
+                "file_name": os.path.basename(file_path),
                 "file_size": stat.st_size,
                 "worksheets": worksheets,
                 "total_worksheets": len(worksheets),
-                "created_time": datetime.fromtimestamp(stat.st_ctime).isoformat() + "Z",
-                "modified_time": datetime.fromtimestamp(stat.st_mtime).isoformat()
-                + "Z",
-                "file_format": file_path.suffix.lower(),
+                "created_time": format_timestamp(stat.st_ctime),
+                "modified_time": format_timestamp(stat.st_mtime),
+                "file_format": os.path.splitext(file_path)[1].lower(),
             }
 
         except Exception as e:
@@ -165,165 +672,159 @@ class ExcelProcessor:
             return {
                 "success": False,
                 "error": f"Cannot get file information: {str(e)}",
-                "file_path": str(file_path.absolute()),
+                "file_path": os.path.abspath(file_path),
             }
 
     def read_worksheet_data(
         self,
-        file_path: Path,
+        file_path: FilePath,
         worksheet_name: Optional[str] = None,
         max_rows: Optional[int] = None,
         include_headers: bool = True,
+        columnar: bool = False,
     ) -> Dict[str, Any]:
-        """Read worksheet data and convert to JSON"""
+        """Read worksheet data and convert to JSON
+
+        With columnar=True the values are returned as one list per column
+        (parallel to "headers") under "columns" instead of row lists under
+        "rows", skipping the transpose.
+        """
         try:
             if not self.is_supported_file(file_path):
+                extension = os.path.splitext(file_path)[1]
                 return {
                     "success": False,
-                    "error": f"Unsupported file format: {file_path.suffix}",
+                    "error": f"Unsupported file format: {extension}",
                     "supported_formats": self.supported_formats,
                 }
 
-            # Read Excel file using pandas
-            if worksheet_name:
-                df = pd.read_excel(
-                    file_path, sheet_name=worksheet_name, engine="openpyxl"
-                )
-            else:
-                df = pd.read_excel(
-                    file_path, sheet_name=0, engine="openpyxl"
-                )  # First sheet
-
-            # Limit number of rows
-            if max_rows and len(df) > max_rows:
-                df = df.head(max_rows)
-
-            # Convert NaN values to None
-            df = df.where(pd.notnull(df), None)
+            # Read Excel file using pandas, stopping after max_rows rows
+            df = self._read_sheet(file_path, worksheet_name, max_rows)
+
+            # Convert data column by column, with the conversion picked once
+            # per column from its dtype: datetime and mixed object columns
+            # go through the formatter (Timestamps are not JSON
+            # serializable), other columns only need missing values replaced
+            # with None where they have any (no object copy of the frame)
+            format_series = self.formatter.format_series
+            columns = []
+            for _, column in df.items():
+                if column.dtype.kind in "mMO":
+                    columns.append(format_series(column))
+                    continue
+                notna = column.notna()
+                if notna.all():
+                    columns.append(column.tolist())
+                else:
+                    columns.append(column.astype(object).where(notna, None).tolist())
 
             # Convert data to dictionary
             if include_headers:
                 # Use column names as headers
                 headers = df.columns.tolist()
-                rows = df.values.tolist()
             else:
-                # Include all data with index
-                headers = ["Index"] + df.columns.tolist()
-                rows = []
-                for idx, row in df.iterrows():
-                    rows.append([idx] + row.tolist())
+                # Include all data with index, as a leading column
+                headers = ["Index", *df.columns]
+                columns.insert(0, df.index.tolist())
 
             # Collect data type information
-            data_types = {}
-            for i, col in enumerate(df.columns):
-                data_types[col] = str(df[col].dtype)
+            data_types = df.dtypes.astype(str).to_dict()
 
-            return {
+            result = {
                 "success": True,
-                "file_path": str(file_path.absolute()),
+                "file_path": os.path.abspath(file_path),
                 "worksheet_name": worksheet_name or df.index.name or "Sheet1",
                 "headers": headers,
-                "rows": rows,
-                "row_count": len(rows),
-                "column_count": len(headers),
-                "data_types": data_types,
-                "max_rows_applied": max_rows,
-                "include_headers": include_headers,
             }
+            if columnar:
+                result["columns"] = columns
+                result["row_count"] = len(df)
+            else:
+                # Transpose the column lists into rows in one pass
+                result["rows"] = rows = [list(row) for row in zip(*columns)]
+                result["row_count"] = len(rows)
+            result.update(
+                {
+                    "column_count": len(headers),
+                    "data_types": data_types,
+                    "max_rows_applied": max_rows,
+                    "include_headers": include_headers,
+                    "columnar": columnar,
+                }
+            )
+            return result
 
         except FileNotFoundError:
             return {
                 "success": False,
                 "error": f"File not found: {file_path}",
-                "file_path": str(file_path.absolute()),
+                "file_path": os.path.abspath(file_path),
             }
         except PermissionError:
             return {
                 "success": False,
                 "error": f"No permission to access file: {file_path}",
-                "file_path": str(file_path.absolute()),
+                "file_path": os.path.abspath(file_path),
             }
         except Exception as e:
             logger.error(f"Failed to read worksheet data: {file_path} - {e}")
             return {
                 "success": False,
                 "error": f"Cannot read data: {str(e)}",
-                "file_path": str(file_path.absolute()),
+                "file_path": os.path.abspath(file_path),
             }
 
-    def get_worksheet_summary(self, file_path: Path) -> Dict[str, Any]:
+    def summarize_and_sample(
+        self, file_path: FilePath, sample_rows: int = 3
+    ) -> Dict[str, Any]:
+        """File information plus the first rows of the first non-empty sheet
+
+        Combines get_file_info and read_worksheet_data: the file is
+        validated and stat'ed once, sheet sizes come from the workbook
+        metadata, and only sample_rows rows are parsed. The sample is added
+        under "sample" (None when every sheet is empty).
+        """
+        summary = self.get_file_info(file_path)
+        if not summary["success"]:
+            return summary
+
+        first_sheet = next(
+            (sheet for sheet in summary["worksheets"] if sheet["has_data"]), None
+        )
+        summary["sample"] = (
+            self.read_worksheet_data(
+                file_path, first_sheet["name"], max_rows=sample_rows
+            )
+            if first_sheet is not None
+            else None
+        )
+        return summary
+
+    def get_worksheet_summary(
+        self, file_path: FilePath, handle: Optional[WorkbookHandle] = None
+    ) -> Dict[str, Any]:
         """Get summary information for all worksheets"""
         try:
             if not self.is_supported_file(file_path):
+                extension = os.path.splitext(file_path)[1]
                 return {
                     "success": False,
-                    "error": f"Unsupported file format: {file_path.suffix}",
+                    "error": f"Unsupported file format: {extension}",
                     "supported_formats": self.supported_formats,
                 }
 
-            # Open workbook using openpyxl
-            workbook = openpyxl.load_workbook(file_path, read_only=True)
-
-            worksheets_summary = []
-
-            for i, sheet_name in enumerate(workbook.sheetnames):
-                worksheet = workbook[sheet_name]
-
-                # Worksheet size
-                max_row = worksheet.max_row
-                max_col = worksheet.max_column
-
-                # Check actual data range
-                has_data = False
-                data_range = None
-
-                if max_row > 1 or max_col > 1:
-                    has_data = True
-                    # Find actual range with data
-                    min_row = max_row
-                    min_col = max_col
-
-                    for row in worksheet.iter_rows():
-                        for cell in row:
-                            if cell.value is not None:
-                                min_row = min(min_row, cell.row)
-                                min_col = min(min_col, cell.column)
-
-                    if min_row <= max_row and min_col <= max_col:
-                        data_range = {
-                            "start_row": min_row,
-                            "end_row": max_row,
-                            "start_column": get_column_letter(min_col),
-                            "end_column": get_column_letter(max_col),
-                        }
-
-                # Header information from first row (if available)
-                headers = []
-                if max_row > 0:
-                    header_row = worksheet[1]
-                    headers = [
-                        cell.value for cell in header_row if cell.value is not None
-                    ]
-
-                worksheets_summary.append(
-                    {
-                        "name": sheet_name,
-                        "index": i,
-                        "row_count": max_row,
-                        "column_count": max_col,
-                        "has_data": has_data,
-                        "data_range": data_range,
-                        "headers": headers,
-                        "header_count": len(headers),
-                    }
-                )
-
-            workbook.close()
+            # Sheet structure from the (cached) workbook handle
+            if handle is None:
+                handle = WorkbookHandle(file_path)
+            error = self._check_container(file_path, handle)
+            if error is not None:
+                return error
+            worksheets_summary = copy.deepcopy(list(handle.worksheets))
 
             return {
                 "success": True,
-                "file_path": str(file_path.absolute()),
-                "file_name": file_path.name,
+                "file_path": os.path.abspath(file_path),
+                "file_name": os.path.basename(file_path),
                 "worksheets": worksheets_summary,
                 "total_worksheets": len(worksheets_summary),
             }
@@ -335,74 +836,85 @@ class ExcelProcessor:
             return {
                 "success": False,
                 "error": f"Cannot get worksheet information: {str(e)}",
-                "file_path": str(file_path.absolute()),
+                "file_path": os.path.abspath(file_path),
             }
 
     def search_in_worksheet(
         self,
-        file_path: Path,
+        file_path: FilePath,
         search_term: str,
         worksheet_name: Optional[str] = None,
         case_sensitive: bool = False,
+        max_matches: Optional[int] = DEFAULT_MAX_MATCHES,
+        offset: int = 0,
     ) -> Dict[str, Any]:
-        """Search for specific text in worksheet"""
+        """Search for specific text in worksheet
+
+        Only matches[offset:offset + max_matches] are returned (all of them
+        when max_matches is None); total_matches is always the full count.
+        """
         try:
             if not self.is_supported_file(file_path):
+                extension = os.path.splitext(file_path)[1]
                 return {
                     "success": False,
-                    "error": f"Unsupported file format: {file_path.suffix}",
+                    "error": f"Unsupported file format: {extension}",
                     "supported_formats": self.supported_formats,
                 }
 
-            # Read Excel file using pandas
-            if worksheet_name:
-                df = pd.read_excel(
-                    file_path, sheet_name=worksheet_name, engine="openpyxl"
-                )
-            else:
-                df = pd.read_excel(file_path, sheet_name=0, engine="openpyxl")
+            # Read Excel file using pandas; the sheet and its string forms
+            # are cached per file version, so further terms searched in the
+            # same sheet skip the read and the conversions
+            key = self._sheet_key(file_path, worksheet_name)
+            df = _read_sheet_full_cached(*key)
 
-            # Execute search
             if not case_sensitive:
                 search_term = search_term.lower()
-                search_df = df.astype(str).apply(lambda x: x.str.lower())
-            else:
-                search_df = df.astype(str)
-
-            # Find search results
-            matches = []
-            for col_idx, col in enumerate(df.columns):
-                for row_idx, value in enumerate(df[col]):
-                    if case_sensitive:
-                        if search_term in str(value):
-                            matches.append(
-                                {
-                                    "row": row_idx + 1,  # 1-based indexing
-                                    "column": col,
-                                    "column_index": col_idx,
-                                    "value": str(value),
-                                    "cell_address": f"{col}{row_idx + 1}",
-                                }
-                            )
-                    else:
-                        if search_term in str(value).lower():
-                            matches.append(
-                                {
-                                    "row": row_idx + 1,
-                                    "column": col,
-                                    "column_index": col_idx,
-                                    "value": str(value),
-                                    "cell_address": f"{col}{row_idx + 1}",
-                                }
-                            )
+
+            # Execute search as one vectorized substring test per column
+            text_df = _search_text_cached(*key)
+            haystack = text_df if case_sensitive else _search_lower_cached(*key)
+            mask = haystack.apply(
+                lambda column: column.str.contains(search_term, regex=False, na=False)
+            )
+
+            # Collect matches column by column (transpose keeps that order)
+            col_indices, row_indices = np.nonzero(mask.to_numpy(dtype=bool).T)
+            total_matches = len(row_indices)
+
+            # Materialize only the requested page of matches
+            offset = max(offset, 0)
+            end = None if max_matches is None else offset + max(max_matches, 0)
+            col_indices = col_indices[offset:end]
+            row_indices = row_indices[offset:end]
+
+            # Only columns with returned matches are converted to Python
+            values = {
+                col_idx: text_df.iloc[:, col_idx].to_numpy(dtype=object)
+                for col_idx in np.unique(col_indices).tolist()
+            }
+            columns = df.columns
+            matches = [
+                {
+                    "row": row_idx + 1,  # 1-based indexing
+                    "column": columns[col_idx],
+                    "column_index": col_idx,
+                    "value": values[col_idx][row_idx],
+                    "cell_address": f"{columns[col_idx]}{row_idx + 1}",
+                }
+                for col_idx, row_idx in zip(col_indices.tolist(), row_indices.tolist())
+            ]
 
             return {
                 "success": True,
-                "file_path": str(file_path.absolute()),
+                "file_path": os.path.abspath(file_path),
                 "worksheet_name": worksheet_name or "Sheet1",
                 "search_term": search_term,
                 "case_sensitive": case_sensitive,
-                "total_matches": len(matches),
+                "total_matches": total_matches,
+                "returned_matches": len(matches),
+                "offset": offset,
+                "has_more": offset + len(matches) < total_matches,
                 "matches": matches,
             }
 
@@ -411,29 +923,86 @@ class ExcelProcessor:
             return {
                 "success": False,
                 "error": f"Error occurred during search: {str(e)}",
-                "file_path": str(file_path.absolute()),
+                "file_path": os.path.abspath(file_path),
             }
 
 
+@functools.lru_cache(maxsize=1)
+def _processor() -> ExcelProcessor:
+    """Shared processor instance used by the convenience functions"""
+    return ExcelProcessor()
+
+
+def clear_caches() -> Dict[str, Any]:
+    """Clear the validation and workbook caches, returning their statistics"""
+    caches = {
+        "file_validation": _validate_file_access,
+        "workbook_summaries": _workbook_summary_cached,
+        "sheet_sizes": _package_sheet_sizes_cached,
+        "calamine_sheet_sizes": _calamine_sheet_sizes_cached,
+        "containers": _detect_container,
+        "sheet_reads": _read_excel_cached,
+        "full_sheet_reads": _read_sheet_full_cached,
+        "search_text": _search_text_cached,
+        "search_lower": _search_lower_cached,
+    }
+    stats = {name: cache.cache_info()._asdict() for name, cache in caches.items()}
+    for cache in caches.values():
+        cache.cache_clear()
+    return stats
+
+
 # Convenience functions
 def get_excel_summary(file_path: str) -> Dict[str, Any]:
     """Convenience function that returns Excel file summary information"""
-    processor = ExcelProcessor()
-    return processor.get_file_info(Path(file_path))
+    return _processor().get_file_info(file_path)
+
+
+def _summary_or_exception(file_path: str) -> Union[Dict[str, Any], Exception]:
+    """get_excel_summary, returning instead of raising any exception"""
+    try:
+        return get_excel_summary(file_path)
+    except Exception as e:
+        return e
+
+
+def get_excel_summaries(
+    file_paths: List[str], return_exceptions: bool = False
+) -> List[Any]:
+    """Convenience function that summarizes several Excel files, in input order
+
+    Files are summarized concurrently in worker threads; sheet sizes come
+    from the workbook metadata, so the work is mostly I/O. Each distinct
+    path is summarized once, even if listed repeatedly. As with
+    asyncio.gather, return_exceptions puts an exception raised for a file
+    in its place in the results instead of raising it.
+    """
+    if not file_paths:
+        return []
+
+    summarize = _summary_or_exception if return_exceptions else get_excel_summary
+    unique_paths = list(dict.fromkeys(file_paths))
+    max_workers = min(MAX_SUMMARY_THREADS, len(unique_paths))
+    with ThreadPoolExecutor(max_workers=max_workers) as threads:
+        results_by_path = dict(zip(unique_paths, threads.map(summarize, unique_paths)))
+    return [results_by_path[file_path] for file_path in file_paths]
 
 
 def read_excel_data(
-    file_path: str, worksheet_name: Optional[str] = None, max_rows: Optional[int] = None
+    file_path: str,
+    worksheet_name: Optional[str] = None,
+    max_rows: Optional[int] = None,
+    columnar: bool = False,
 ) -> Dict[str, Any]:
     """Convenience function to read Excel file data"""
-    processor = ExcelProcessor()
-    return processor.read_worksheet_data(Path(file_path), worksheet_name, max_rows)
+    return _processor().read_worksheet_data(
+        file_path, worksheet_name, max_rows, columnar=columnar
+    )
 
 
 def get_worksheet_summary(file_path: str) -> Dict[str, Any]:
     """Convenience function that returns worksheet summary information"""
-    processor = ExcelProcessor()
-    return processor.get_worksheet_summary(Path(file_path))
+    return _processor().get_worksheet_summary(file_path)
 
 
 def search_in_excel(
@@ -441,9 +1010,15 @@ def search_in_excel(
     search_term: str,
     worksheet_name: Optional[str] = None,
     case_sensitive: bool = False,
+    max_matches: Optional[int] = DEFAULT_MAX_MATCHES,
+    offset: int = 0,
 ) -> Dict[str, Any]:
     """Convenience function to search text in Excel file"""
-    processor = ExcelProcessor()
-    return processor.search_in_worksheet(
-        Path(file_path), search_term, worksheet_name, case_sensitive
+    return _processor().search_in_worksheet(
+        file_path,
+        search_term,
+        worksheet_name,
+        case_sensitive,
+        max_matches,
+        offset,
     )
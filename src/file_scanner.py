@@ -4,29 +4,99 @@ File Scanner Module
 Module responsible for Excel file search and metadata collection
 """
 
+import fnmatch
+import functools
 import logging
+import os
+import re
+import stat as stat_module
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, Optional
-from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 from .config_manager import config_manager
+from .data_formatter import format_timestamp
 
 logger = logging.getLogger(__name__)
 
 # Supported Excel file extensions (will be loaded from config)
 EXCEL_EXTENSIONS = config_manager.get_supported_extensions()
+EXCEL_EXTENSION_SET = config_manager.get_supported_extension_set()
+
+# Longest first so that ".xlsx" is tried before a shorter ".xls"
+_EXCEL_EXTENSION_TUPLE = tuple(sorted(EXCEL_EXTENSION_SET, key=len, reverse=True))
+
+# Number of threads used to list subdirectories and stat files
+MAX_SCAN_WORKERS = 8
+
+# Batches with at least this many files are stat'ed concurrently
+STAT_BATCH_MIN = 64
+
+# Number of directory listings kept by list_excel_files
+LIST_CACHE_SIZE = 32
+
+# (resolved directory, recursive, max_files) -> (mtime_ns of every directory
+# walked, result); guarded by _LIST_CACHE_LOCK, least recently used first
+_LIST_CACHE: Dict[
+    Tuple[str, bool, Optional[int]],
+    Tuple[List[Tuple[str, int]], Dict[str, Any]],
+] = {}
+_LIST_CACHE_LOCK = threading.Lock()
+
+
+# Characters with a special meaning in shell-style patterns
+_GLOB_CHARS = frozenset("*?[")
+
+
+@functools.lru_cache(maxsize=128)
+def _name_filter(pattern: str) -> Callable[[str], bool]:
+    """File name filter for a shell-style pattern (fnmatch case rules)
+
+    "*text*" patterns, the common "name contains" search, become a plain
+    substring test; other patterns are compiled to a regex. Filters are
+    memoized, so repeated searches reuse them.
+    """
+    normcase = os.path.normcase
+    pattern = normcase(pattern)
+    needle = pattern[1:-1]
+    if (
+        len(pattern) > 2
+        and pattern[0] == pattern[-1] == "*"
+        and _GLOB_CHARS.isdisjoint(needle)
+    ):
+        return lambda name: needle in normcase(name)
+
+    match = re.compile(fnmatch.translate(pattern)).match
+    return lambda name: match(normcase(name)) is not None
+
+
+def _directory_mtimes(directories: List[str]) -> List[Tuple[str, int]]:
+    """(path, mtime_ns) of each directory; -1 for one that cannot be stat'ed"""
+    mtimes = []
+    for path in directories:
+        try:
+            mtimes.append((path, os.stat(path).st_mtime_ns))
+        except OSError:
+            mtimes.append((path, -1))
+    return mtimes
 
 
 class FileScanner:
     """Excel file search and metadata collection class"""
 
     def __init__(self):
-        self.supported_extensions = set(config_manager.get_supported_extensions())
+        self.supported_extensions = EXCEL_EXTENSION_SET
+        self._ext_tuple = _EXCEL_EXTENSION_TUPLE
         self.config_manager = config_manager
 
     def is_excel_file(self, file_path: Path) -> bool:
         """Check if the file is an Excel file"""
-        return file_path.suffix.lower() in self.supported_extensions
+        return self.is_excel_name(file_path.name.lower())
+
+    def is_excel_name(self, lower_name: str) -> bool:
+        """Check an already lowercased file name against supported extensions"""
+        return lower_name.endswith(self._ext_tuple)
 
     def is_path_within_work_directory(self, path: str) -> bool:
         """Check if the path is within work directory"""
@@ -35,10 +105,14 @@ class FileScanner:
     def validate_directory_path(self, directory_path: str) -> Dict[str, Any]:
         """Validate directory path and return validation result"""
         try:
-            directory = Path(directory_path)
+            # Resolve once; the existence, type and work directory checks
+            # below all reuse the resolved path
+            directory = os.path.realpath(directory_path)
 
             # Check if path exists
-            if not directory.exists():
+            try:
+                directory_stat = os.stat(directory)
+            except (FileNotFoundError, NotADirectoryError):
                 return {
                     "valid": False,
                     "error": f"Directory does not exist: {directory_path}",
@@ -46,7 +120,7 @@ class FileScanner:
                 }
 
             # Check if it's a directory
-            if not directory.is_dir():
+            if not stat_module.S_ISDIR(directory_stat.st_mode):
                 return {
                     "valid": False,
                     "error": f"Path is not a directory: {directory_path}",
@@ -54,7 +128,7 @@ class FileScanner:
                 }
 
             # Check if path is within work directory
-            if not self.is_path_within_work_directory(directory_path):
+            if not self.config_manager.is_real_path_within_work_directory(directory):
                 work_dir = self.config_manager.get_work_directory()
                 return {
                     "valid": False,
@@ -65,7 +139,7 @@ class FileScanner:
 
             return {
                 "valid": True,
-                "directory": str(directory.resolve()),
+                "directory": directory,
                 "allowed": True,
             }
 
@@ -76,36 +150,175 @@ class FileScanner:
                 "error_code": "VALIDATION_ERROR",
             }
 
-    def get_file_metadata(self, file_path: Path) -> Dict[str, Any]:
-        """Collect file metadata"""
+    def get_file_metadata(
+        self, file_path: Union[str, Path], stat: Optional[os.stat_result] = None
+    ) -> Dict[str, Any]:
+        """Collect file metadata (stat is reused when already available)
+
+        Names are derived with os.path so scan results, which pass the
+        DirEntry path string, do not need a Path object per file.
+        """
+        path = os.path.abspath(file_path)
+        file_name = os.path.basename(path)
+        extension = os.path.splitext(file_name)[1].lower()
         try:
-            stat = file_path.stat()
+            if stat is None:
+                stat = os.stat(path)
             return {
-                "file_path": str(file_path.absolute()),
-                "file_name": file_path.name,
+                "file_path": path,
+                "file_name": file_name,
                 "file_size": stat.st_size,
-                "modified_time": datetime.fromtimestamp(stat.st_mtime).isoformat()
-                + "Z",
-                "created_time": datetime.fromtimestamp(stat.st_ctime).isoformat() + "Z",
-                "extension": file_path.suffix.lower(),
+                "modified_time": format_timestamp(stat.st_mtime),
+                "created_time": format_timestamp(stat.st_ctime),
+                "extension": extension,
             }
         except (OSError, PermissionError) as e:
             logger.warning(f"Failed to collect file metadata: {file_path} - {e}")
             return {
-                "file_path": str(file_path.absolute()),
-                "file_name": file_path.name,
+                "file_path": path,
+                "file_name": file_name,
                 "file_size": 0,
                 "modified_time": None,
                 "created_time": None,
-                "extension": file_path.suffix.lower(),
+                "extension": extension,
                 "error": str(e),
             }
 
+    def _scan_single_directory(
+        self,
+        directory: str,
+        recursive: bool = True,
+        limit: Optional[int] = None,
+        name_filter: Optional[Callable[[str], bool]] = None,
+    ) -> Tuple[List[os.DirEntry], List[str], int]:
+        """Scan one directory level
+
+        Returns (Excel file entries, subdirectories, number of Excel-named
+        entries scanned). Entries are not stat'ed here; see _stat_entries.
+        Subdirectories are only collected in recursive mode; the listing
+        stops once limit files have been found. name_filter, if given, must
+        also accept a file's name for it to be returned.
+        """
+        excel_files = []
+        subdirectories = []
+        scanned_count = 0
+        is_excel_name = self.is_excel_name
+
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    # Reject by name first; only Excel names are stat'ed later
+                    if is_excel_name(entry.name.lower()):
+                        scanned_count += 1
+                        if entry.is_file():
+                            if name_filter is not None and not name_filter(entry.name):
+                                continue
+                            excel_files.append(entry)
+                            if limit is not None and len(excel_files) >= limit:
+                                break
+                            continue
+
+                    # Symlinked directories are not followed (same as glob)
+                    if recursive and entry.is_dir(follow_symlinks=False):
+                        subdirectories.append(entry.path)
+        except PermissionError as e:
+            logger.warning(f"Skipping unreadable directory: {directory} - {e}")
+
+        return excel_files, subdirectories, scanned_count
+
+    @staticmethod
+    def _stat_entry(entry: os.DirEntry) -> Optional[os.stat_result]:
+        try:
+            return entry.stat()
+        except OSError:
+            return None
+
+    def _stat_entries(
+        self, entries: List[os.DirEntry], executor: Optional[ThreadPoolExecutor]
+    ) -> List[Optional[os.stat_result]]:
+        """Stat a batch of entries, concurrently for large batches
+
+        Keeping several stat calls in flight lets the kernel overlap them
+        on cold caches and network drives.
+        """
+        if executor is not None and len(entries) >= STAT_BATCH_MIN:
+            return list(executor.map(self._stat_entry, entries))
+        return [self._stat_entry(entry) for entry in entries]
+
+    def _walk(
+        self,
+        directory: str,
+        recursive: bool = True,
+        max_files: Optional[int] = None,
+        name_filter: Optional[Callable[[str], bool]] = None,
+        directory_mtimes: Optional[List[Tuple[str, int]]] = None,
+    ) -> Tuple[List[Dict[str, Any]], int, bool]:
+        """Collect metadata of the Excel files under a directory
+
+        Returns (file metadata, number of Excel-named entries scanned,
+        whether max_files cut the listing short). When directory_mtimes is
+        given, (path, mtime_ns) of every directory listed is appended to it,
+        stat'ed before the listing so later changes show a newer mtime.
+        """
+        excel_files = []
+        scanned_count = 0
+        truncated = False
+
+        # Scan level by level; subdirectories of a level are scanned
+        # concurrently since directory listing and stat are I/O bound
+        executor = ThreadPoolExecutor(max_workers=MAX_SCAN_WORKERS)
+        get_file_metadata = self.get_file_metadata
+        try:
+            level = [directory]
+            while level:
+                if directory_mtimes is not None:
+                    directory_mtimes.extend(_directory_mtimes(level))
+                # No directory needs to yield more than the remaining budget
+                limit = max_files - len(excel_files) if max_files else None
+                scan = functools.partial(
+                    self._scan_single_directory,
+                    recursive=recursive,
+                    limit=limit,
+                    name_filter=name_filter,
+                )
+                if len(level) > 1:
+                    results = list(executor.map(scan, level))
+                else:
+                    results = [scan(path) for path in level]
+
+                candidates = []
+                next_level = []
+                for found_entries, subdirectories, count in results:
+                    scanned_count += count
+                    next_level.extend(subdirectories)
+                    candidates.extend(found_entries)
+
+                # Check file count limit
+                if max_files and len(excel_files) + len(candidates) >= max_files:
+                    candidates = candidates[: max_files - len(excel_files)]
+                    truncated = True
+
+                # Stat the whole level as one batch
+                stats = self._stat_entries(candidates, executor)
+                for entry, stat in zip(candidates, stats):
+                    excel_files.append(get_file_metadata(entry.path, stat))
+
+                if truncated:
+                    logger.info(f"Maximum file count reached: {max_files}")
+                    break
+
+                level = next_level
+        finally:
+            executor.shutdown()
+
+        return excel_files, scanned_count, truncated
+
     def scan_directory(
         self,
         directory_path: str,
         recursive: bool = True,
         max_files: Optional[int] = None,
+        directory_mtimes: Optional[List[Tuple[str, int]]] = None,
     ) -> Dict[str, Any]:
         """
         Search for Excel files in directory
@@ -114,6 +327,8 @@ class FileScanner:
             directory_path: Directory path to search for Excel files
             recursive: Whether to search recursively in subdirectories
             max_files: Maximum number of files to return (None for unlimited)
+            directory_mtimes: If given, (path, mtime_ns) of every directory
+                listed is appended to it
 
         Returns:
             Search result dictionary
@@ -137,34 +352,16 @@ class FileScanner:
                     "work_directory": validation.get("work_directory", ""),
                 }
 
-            directory = Path(validation["directory"])
-
             logger.info(
                 f"Excel file search started: {directory_path} (recursive: {recursive})"
             )
 
-            excel_files = []
-            scanned_count = 0
-
-            # Set file search pattern
-            if recursive:
-                pattern = "**/*"
-            else:
-                pattern = "*"
-
-            # Execute file search
-            for file_path in directory.glob(pattern):
-                scanned_count += 1
-
-                # Check file count limit
-                if max_files and len(excel_files) >= max_files:
-                    logger.info(f"Maximum file count reached: {max_files}")
-                    break
-
-                # Check if it's an Excel file
-                if file_path.is_file() and self.is_excel_file(file_path):
-                    metadata = self.get_file_metadata(file_path)
-                    excel_files.append(metadata)
+            excel_files, scanned_count, truncated = self._walk(
+                validation["directory"],
+                recursive,
+                max_files,
+                directory_mtimes=directory_mtimes,
+            )
 
             logger.info(
                 f"Search completed: {len(excel_files)} Excel files found (total {scanned_count} files scanned)"
@@ -175,6 +372,7 @@ class FileScanner:
                 "directory": directory_path,
                 "total_files": len(excel_files),
                 "scanned_files": scanned_count,
+                "truncated": truncated,
                 "files": excel_files,
                 "supported_extensions": list(self.supported_extensions),
             }
@@ -231,18 +429,25 @@ class FileScanner:
                 f"Filename pattern search: {filename_pattern} in {directory_path}"
             )
 
-            excel_files = []
-
-            # Execute pattern search
-            if recursive:
-                search_pattern = f"**/{filename_pattern}"
+            # Patterns with a path component are left to glob; plain name
+            # patterns are matched during the same scandir walk as listings
+            if os.sep in filename_pattern or "/" in filename_pattern:
+                if recursive:
+                    search_pattern = f"**/{filename_pattern}"
+                else:
+                    search_pattern = filename_pattern
+
+                excel_files = [
+                    self.get_file_metadata(file_path)
+                    for file_path in directory.glob(search_pattern)
+                    if file_path.is_file() and self.is_excel_file(file_path)
+                ]
             else:
-                search_pattern = filename_pattern
-
-            for file_path in directory.glob(search_pattern):
-                if file_path.is_file() and self.is_excel_file(file_path):
-                    metadata = self.get_file_metadata(file_path)
-                    excel_files.append(metadata)
+                excel_files, _, _ = self._walk(
+                    str(directory),
+                    recursive,
+                    name_filter=_name_filter(filename_pattern),
+                )
 
             logger.info(f"Pattern search completed: {len(excel_files)} files found")
 
@@ -266,18 +471,63 @@ class FileScanner:
             }
 
 
+@functools.lru_cache(maxsize=1)
+def _scanner() -> FileScanner:
+    """Shared scanner instance used by the convenience functions"""
+    return FileScanner()
+
+
 # Convenience functions
+def _copy_listing(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of a listing that shares no mutable state with the original"""
+    copy = dict(result)
+    copy["files"] = [dict(file_info) for file_info in result["files"]]
+    copy["supported_extensions"] = list(result["supported_extensions"])
+    return copy
+
+
 def list_excel_files(
     directory_path: str, recursive: bool = True, max_files: Optional[int] = None
 ) -> Dict[str, Any]:
-    """Convenience function that returns Excel file list"""
-    scanner = FileScanner()
-    return scanner.scan_directory(directory_path, recursive, max_files)
+    """Convenience function that returns Excel file list
+
+    Successful listings are cached per resolved directory and reused while
+    the mtime of every directory walked is unchanged, i.e. no file was
+    added, removed or renamed anywhere in the tree. Edits to the contents
+    of an existing file do not touch directory mtimes, so the size and
+    modified time listed for such a file can lag until the next rescan.
+    """
+    key = (os.path.realpath(directory_path), recursive, max_files)
+    with _LIST_CACHE_LOCK:
+        cached = _LIST_CACHE.get(key)
+    if cached is not None:
+        mtimes, listing = cached
+        if _directory_mtimes([path for path, _ in mtimes]) == mtimes:
+            with _LIST_CACHE_LOCK:
+                # Mark as most recently used
+                if _LIST_CACHE.get(key) is cached:
+                    _LIST_CACHE[key] = _LIST_CACHE.pop(key)
+            result = _copy_listing(listing)
+            result["directory"] = directory_path
+            return result
+
+    mtimes = []
+    result = _scanner().scan_directory(
+        directory_path, recursive, max_files, directory_mtimes=mtimes
+    )
+    if result.get("success"):
+        with _LIST_CACHE_LOCK:
+            _LIST_CACHE.pop(key, None)
+            _LIST_CACHE[key] = (mtimes, _copy_listing(result))
+            while len(_LIST_CACHE) > LIST_CACHE_SIZE:
+                del _LIST_CACHE[next(iter(_LIST_CACHE))]
+    return result
 
 
 def find_excel_files_by_name(
     directory_path: str, filename_pattern: str, recursive: bool = True
 ) -> Dict[str, Any]:
     """Convenience function to search Excel files by filename pattern"""
-    scanner = FileScanner()
-    return scanner.find_excel_files_by_name(directory_path, filename_pattern, recursive)
+    return _scanner().find_excel_files_by_name(
+        directory_path, filename_pattern, recursive
+    )
@@ -5,14 +5,21 @@ Main module of MCP server for Excel file search and processing
 """
 
 import asyncio
+import contextlib
+import functools
+import io
 import json
 import logging
-from typing import Any, Dict, List
+import sys
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Union
+
+import anyio
 
 from mcp.server import Server
 from mcp.server.models import InitializationOptions
 from mcp.server.stdio import stdio_server
 from mcp.types import (
+    CallToolResult,
     TextContent,
     Tool,
 )
@@ -21,11 +28,24 @@ from mcp.types import (
 from .file_scanner import list_excel_files
 from .excel_processor import (
     get_excel_summary,
+    get_excel_summaries,
     read_excel_data,
     get_worksheet_summary,
     search_in_excel,
+    clear_caches,
 )
 from .config_manager import config_manager
+from .data_formatter import json_default, replace_non_finite
+
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
+# orjson options, combined once at import
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+    _ORJSON_PRETTY_OPTIONS = _ORJSON_OPTIONS | orjson.OPT_INDENT_2
 
 # Logging configuration
 logging.basicConfig(level=logging.INFO)
@@ -35,23 +55,110 @@ logger = logging.getLogger(__name__)
 app = Server("excel-search-mcp")
 
 
+def _to_text(obj: Any) -> TextContent:
+    """Serialize a tool result as JSON text
+
+    Output is compact unless "server.pretty_json" is enabled, in which case
+    it is indented by 2 spaces. orjson is used when installed; both
+    encoders emit non-ASCII characters as-is and encode numpy, pandas and
+    NaN values alike.
+    """
+    pretty = config_manager.get_pretty_json()
+    if orjson is not None:
+        option = _ORJSON_PRETTY_OPTIONS if pretty else _ORJSON_OPTIONS
+        text = orjson.dumps(obj, default=json_default, option=option).decode()
+    elif pretty:
+        text = json.dumps(
+            replace_non_finite(obj), ensure_ascii=False, indent=2, default=json_default
+        )
+    else:
+        text = json.dumps(
+            replace_non_finite(obj),
+            ensure_ascii=False,
+            separators=(",", ":"),
+            default=json_default,
+        )
+    return TextContent(type="text", text=text)
+
+
+# Tool results can be returned as structured content (MCP 2025-06-18) when
+# the installed mcp package supports it and the server is configured for it
+_STRUCTURED_CONTENT_SUPPORTED = "structuredContent" in getattr(
+    CallToolResult, "model_fields", {}
+)
+
+ToolResponse = Union[List[TextContent], CallToolResult]
+
+
+def _respond(obj: Dict[str, Any]) -> ToolResponse:
+    """Build the response for a tool result
+
+    The result is serialized into a single TextContent. With
+    "server.structured_content" enabled it is also passed as
+    structuredContent, decoded back from that JSON text so both carry the
+    same JSON-native values (no numpy scalars or Timestamps).
+    """
+    text_content = _to_text(obj)
+    if _STRUCTURED_CONTENT_SUPPORTED and config_manager.get_structured_content():
+        loads = orjson.loads if orjson is not None else json.loads
+        return CallToolResult(
+            content=[text_content],
+            structuredContent=loads(text_content.text),
+            isError=not obj.get("success", True),
+        )
+    return [text_content]
+
+
+@functools.lru_cache(maxsize=32)
+def _error_response_cached(
+    message: str, pretty: bool, structured: bool
+) -> ToolResponse:
+    return _respond({"success": False, "error": message})
+
+
+def _error_response(message: str) -> ToolResponse:
+    """Return the response for a fixed validation error message
+
+    The encoded response only depends on the message and the output
+    settings, so it is built once per combination and shared; the MCP
+    server never mutates returned content.
+    """
+    return _error_response_cached(
+        message,
+        config_manager.get_pretty_json(),
+        config_manager.get_structured_content(),
+    )
+
+
 # Excel related functions - using actual implementation
-def get_multiple_excel_summaries(file_paths: List[str]) -> Dict[str, Any]:
-    """Function that returns summary information for multiple Excel files"""
+async def get_multiple_excel_summaries(file_paths: List[str]) -> Dict[str, Any]:
+    """Function that returns summary information for multiple Excel files
+
+    Files are summarized concurrently by get_excel_summaries, run off the
+    event loop.
+    """
     logger.info("Getting summaries for %d Excel files", len(file_paths))
 
-    summaries = []
+    # Results in input order; in the common case where nothing raised,
+    # this list is returned as-is
+    loop = asyncio.get_running_loop()
+    summaries = await loop.run_in_executor(
+        None, functools.partial(get_excel_summaries, file_paths, return_exceptions=True)
+    )
     errors = []
 
-    for file_path in file_paths:
-        try:
-            summary = get_excel_summary(file_path)
-            summaries.append(summary)
-        except Exception as e:
-            logger.error(
-                "Failed to get file summary information: %s - %s", file_path, e
-            )
-            errors.append({"file_path": file_path, "error": str(e)})
+    if any(isinstance(result, Exception) for result in summaries):
+        for file_path, result in zip(file_paths, summaries):
+            if isinstance(result, Exception):
+                logger.error(
+                    "Failed to get file summary information: %s - %s",
+                    file_path,
+                    result,
+                )
+                errors.append({"file_path": file_path, "error": str(result)})
+        summaries = [
+            result for result in summaries if not isinstance(result, Exception)
+        ]
 
     return {
         "success": True,
@@ -63,289 +170,286 @@ def get_multiple_excel_summaries(file_paths: List[str]) -> Dict[str, Any]:
     }
 
 
-# MCP tool definitions
-@app.list_tools()
-async def list_tools() -> List[Tool]:
-    """Returns a list of available tools."""
-    return [
-        Tool(
-            name="list_excel_files",
-            description=(
-                "Search and return a list of Excel files in the configured work directory"
-            ),
-            inputSchema={
-                "type": "object",
-                "properties": {},
-                "required": [],
-            },
+# MCP tool definitions, built once at import. The lists are shared by every
+# list_tools call and must not be modified.
+_TOOLS: List[Tool] = [
+    Tool(
+        name="list_excel_files",
+        description=(
+            "Search and return a list of Excel files in the configured work directory"
         ),
-        Tool(
-            name="get_excel_summary",
-            description=(
-                "Get summary information about Excel file(s) including "
-                "worksheets and metadata. Can process single file or multiple files."
-            ),
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "file_path": {
-                        "type": "string",
-                        "description": "Absolute path to a single Excel file",
-                    },
-                    "file_paths": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "List of Excel file paths to process",
-                    },
-                },
-                "anyOf": [{"required": ["file_path"]}, {"required": ["file_paths"]}],
-            },
+        inputSchema={
+            "type": "object",
+            "properties": {},
+            "required": [],
+        },
+    ),
+    Tool(
+        name="get_excel_summary",
+        description=(
+            "Get summary information about Excel file(s) including "
+            "worksheets and metadata. Can process single file or multiple files."
         ),
-        Tool(
-            name="read_excel_data",
-            description="Read Excel file data and convert it to JSON format",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "file_path": {
-                        "type": "string",
-                        "description": ("Absolute path to the Excel file"),
-                    },
-                    "worksheet_name": {
-                        "type": "string",
-                        "description": (
-                            "Name of the worksheet to read (defaults to first "
-                            "worksheet if not specified)"
-                        ),
-                    },
-                    "max_rows": {
-                        "type": "integer",
-                        "description": (
-                            "Maximum number of rows to read (reads all rows if "
-                            "not specified)"
-                        ),
-                    },
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "file_path": {
+                    "type": "string",
+                    "description": "Absolute path to a single Excel file",
+                },
+                "file_paths": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "List of Excel file paths to process",
                 },
-                "required": ["file_path"],
             },
-        ),
-        Tool(
-            name="search_in_excel",
-            description="Search for specific text within Excel file(s)",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "file_path": {
-                        "type": "string",
-                        "description": "Absolute path to the Excel file",
-                    },
-                    "search_term": {
-                        "type": "string",
-                        "description": "Text to search for",
-                    },
-                    "worksheet_name": {
-                        "type": "string",
-                        "description": "Specific worksheet to search (optional)",
-                    },
-                    "case_sensitive": {
-                        "type": "boolean",
-                        "description": "Whether search should be case sensitive",
-                        "default": False,
-                    },
+            "anyOf": [{"required": ["file_path"]}, {"required": ["file_paths"]}],
+        },
+    ),
+    Tool(
+        name="read_excel_data",
+        description="Read Excel file data and convert it to JSON format",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "file_path": {
+                    "type": "string",
+                    "description": ("Absolute path to the Excel file"),
+                },
+                "worksheet_name": {
+                    "type": "string",
+                    "description": (
+                        "Name of the worksheet to read (defaults to first "
+                        "worksheet if not specified)"
+                    ),
+                },
+                "max_rows": {
+                    "type": "integer",
+                    "description": (
+                        "Maximum number of rows to read (reads all rows if "
+                        "not specified)"
+                    ),
                 },
-                "required": ["file_path", "search_term"],
             },
-        ),
-        Tool(
-            name="get_worksheet_summary",
-            description="Get detailed summary of all worksheets in an Excel file",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "file_path": {
-                        "type": "string",
-                        "description": "Absolute path to the Excel file",
-                    }
+            "required": ["file_path"],
+        },
+    ),
+    Tool(
+        name="search_in_excel",
+        description="Search for specific text within Excel file(s)",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "file_path": {
+                    "type": "string",
+                    "description": "Absolute path to the Excel file",
+                },
+                "search_term": {
+                    "type": "string",
+                    "description": "Text to search for",
+                },
+                "worksheet_name": {
+                    "type": "string",
+                    "description": "Specific worksheet to search (optional)",
+                },
+                "case_sensitive": {
+                    "type": "boolean",
+                    "description": "Whether search should be case sensitive",
+                    "default": False,
+                },
+                "max_matches": {
+                    "type": "integer",
+                    "description": "Maximum number of matches to return",
+                    "default": 10000,
+                },
+                "offset": {
+                    "type": "integer",
+                    "description": "Number of matches to skip (for paging)",
+                    "default": 0,
                 },
-                "required": ["file_path"],
             },
-        ),
-    ]
+            "required": ["file_path", "search_term"],
+        },
+    ),
+    Tool(
+        name="get_worksheet_summary",
+        description="Get detailed summary of all worksheets in an Excel file",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "file_path": {
+                    "type": "string",
+                    "description": "Absolute path to the Excel file",
+                }
+            },
+            "required": ["file_path"],
+        },
+    ),
+]
+
+# Cache maintenance is only exposed when "server.debug" is enabled
+_DEBUG_TOOLS: List[Tool] = _TOOLS + [
+    Tool(
+        name="clear_cache",
+        description="Clear cached file validation and workbook summaries",
+        inputSchema={"type": "object", "properties": {}, "required": []},
+    )
+]
+
+
+@app.list_tools()
+async def list_tools() -> List[Tool]:
+    """Returns a list of available tools."""
+    return _DEBUG_TOOLS if config_manager.get_debug() else _TOOLS
+
+
+async def _handle_list_excel_files(arguments: Dict[str, Any]) -> ToolResponse:
+    directory_path = config_manager.get_work_directory()
+    recursive = config_manager.get_recursive_search()
+    max_files = config_manager.get_max_files_per_search()
+
+    result = list_excel_files(directory_path, recursive, max_files)
+    return _respond(result)
+
+
+async def _handle_get_excel_summary(arguments: Dict[str, Any]) -> ToolResponse:
+    file_path = arguments.get("file_path")
+    file_paths = arguments.get("file_paths")
+
+    # Single file processing
+    if file_path and not file_paths:
+        result = get_excel_summary(file_path)
+        return _respond(result)
+
+    # Multiple files processing
+    elif file_paths is not None and not file_path:
+        if not isinstance(file_paths, list) or len(file_paths) == 0:
+            return _error_response("file_paths must be a non-empty list")
+
+        result = await get_multiple_excel_summaries(file_paths)
+        return _respond(result)
+
+    # Parameter error
+    else:
+        return _error_response(
+            "Either file_path or file_paths is required, but not both"
+        )
+
+
+async def _handle_read_excel_data(arguments: Dict[str, Any]) -> ToolResponse:
+    file_path = arguments.get("file_path")
+    worksheet_name = arguments.get("worksheet_name")
+    max_rows = arguments.get("max_rows")
+
+    if not file_path:
+        return _error_response("file_path is required")
+
+    result = read_excel_data(file_path, worksheet_name, max_rows)
+    return _respond(result)
+
+
+async def _handle_search_in_excel(arguments: Dict[str, Any]) -> ToolResponse:
+    file_path = arguments.get("file_path")
+    search_term = arguments.get("search_term")
+    worksheet_name = arguments.get("worksheet_name")
+    case_sensitive = arguments.get("case_sensitive", False)
+    max_matches = arguments.get("max_matches", 10000)
+    offset = arguments.get("offset", 0)
+
+    if not file_path or not search_term:
+        return _error_response("file_path and search_term are required")
+
+    result = search_in_excel(
+        file_path,
+        search_term,
+        worksheet_name,
+        case_sensitive,
+        max_matches=max_matches,
+        offset=offset,
+    )
+    return _respond(result)
+
+
+async def _handle_get_worksheet_summary(arguments: Dict[str, Any]) -> ToolResponse:
+    file_path = arguments.get("file_path")
+
+    if not file_path:
+        return _error_response("file_path is required")
+
+    result = get_worksheet_summary(file_path)
+    return _respond(result)
+
+
+async def _handle_clear_cache(arguments: Dict[str, Any]) -> ToolResponse:
+    return _respond({"success": True, "cleared": clear_caches()})
+
+
+# Tool name -> handler
+_HANDLERS: Dict[str, Callable[[Dict[str, Any]], Awaitable[ToolResponse]]] = {
+    "list_excel_files": _handle_list_excel_files,
+    "get_excel_summary": _handle_get_excel_summary,
+    "read_excel_data": _handle_read_excel_data,
+    "search_in_excel": _handle_search_in_excel,
+    "get_worksheet_summary": _handle_get_worksheet_summary,
+}
+
+_DEBUG_HANDLERS = {**_HANDLERS, "clear_cache": _handle_clear_cache}
 
 
 @app.call_tool()
-async def call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
+async def call_tool(name: str, arguments: Dict[str, Any]) -> ToolResponse:
     """Handles tool calls."""
-    try:
-        logger.info("Calling tool: %s with arguments: %s", name, arguments)
-
-        if name == "list_excel_files":
-            directory_path = config_manager.get_work_directory()
-            recursive = config_manager.get_recursive_search()
-            max_files = config_manager.get_max_files_per_search()
+    handlers = _DEBUG_HANDLERS if config_manager.get_debug() else _HANDLERS
+    handler = handlers.get(name)
+    if handler is None:
+        return _respond({"success": False, "error": f"Unknown tool: {name}"})
 
-            result = list_excel_files(directory_path, recursive, max_files)
-            return [
-                TextContent(
-                    type="text", text=json.dumps(result, ensure_ascii=False, indent=2)
-                )
-            ]
-
-        elif name == "get_excel_summary":
-            file_path = arguments.get("file_path")
-            file_paths = arguments.get("file_paths")
-
-            # Single file processing
-            if file_path and not file_paths:
-                result = get_excel_summary(file_path)
-                return [
-                    TextContent(
-                        type="text",
-                        text=json.dumps(result, ensure_ascii=False, indent=2),
-                    )
-                ]
-
-            # Multiple files processing
-            elif file_paths is not None and not file_path:
-                if not isinstance(file_paths, list) or len(file_paths) == 0:
-                    return [
-                        TextContent(
-                            type="text",
-                            text=json.dumps(
-                                {
-                                    "success": False,
-                                    "error": "file_paths must be a non-empty list",
-                                },
-                                ensure_ascii=False,
-                                indent=2,
-                            ),
-                        )
-                    ]
-
-                result = get_multiple_excel_summaries(file_paths)
-                return [
-                    TextContent(
-                        type="text",
-                        text=json.dumps(result, ensure_ascii=False, indent=2),
-                    )
-                ]
-
-            # Parameter error
-            else:
-                return [
-                    TextContent(
-                        type="text",
-                        text=json.dumps(
-                            {
-                                "success": False,
-                                "error": "Either file_path or file_paths is required, but not both",
-                            },
-                            ensure_ascii=False,
-                            indent=2,
-                        ),
-                    )
-                ]
-
-        elif name == "read_excel_data":
-            file_path = arguments.get("file_path")
-            worksheet_name = arguments.get("worksheet_name")
-            max_rows = arguments.get("max_rows")
-
-            if not file_path:
-                return [
-                    TextContent(
-                        type="text",
-                        text=json.dumps(
-                            {"success": False, "error": "file_path is required"},
-                            ensure_ascii=False,
-                            indent=2,
-                        ),
-                    )
-                ]
-
-            result = read_excel_data(file_path, worksheet_name, max_rows)
-            return [
-                TextContent(
-                    type="text", text=json.dumps(result, ensure_ascii=False, indent=2)
-                )
-            ]
-
-        elif name == "search_in_excel":
-            file_path = arguments.get("file_path")
-            search_term = arguments.get("search_term")
-            worksheet_name = arguments.get("worksheet_name")
-            case_sensitive = arguments.get("case_sensitive", False)
-
-            if not file_path or not search_term:
-                return [
-                    TextContent(
-                        type="text",
-                        text=json.dumps(
-                            {
-                                "success": False,
-                                "error": "file_path and search_term are required",
-                            },
-                            ensure_ascii=False,
-                            indent=2,
-                        ),
-                    )
-                ]
-
-            result = search_in_excel(
-                file_path, search_term, worksheet_name, case_sensitive
-            )
-            return [
-                TextContent(
-                    type="text", text=json.dumps(result, ensure_ascii=False, indent=2)
-                )
-            ]
-
-        elif name == "get_worksheet_summary":
-            file_path = arguments.get("file_path")
-
-            if not file_path:
-                return [
-                    TextContent(
-                        type="text",
-                        text=json.dumps(
-                            {"success": False, "error": "file_path is required"},
-                            ensure_ascii=False,
-                            indent=2,
-                        ),
-                    )
-                ]
-
-            result = get_worksheet_summary(file_path)
-            return [
-                TextContent(
-                    type="text", text=json.dumps(result, ensure_ascii=False, indent=2)
-                )
-            ]
-
-        else:
-            return [
-                TextContent(
-                    type="text",
-                    text=json.dumps(
-                        {"success": False, "error": f"Unknown tool: {name}"},
-                        ensure_ascii=False,
-                        indent=2,
-                    ),
-                )
-            ]
+    try:
+        # Only argument names are logged; values such as long file_paths
+        # lists would be repr'd on every call
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Calling tool: %s with arguments: %s", name, sorted(arguments))
+        return await handler(arguments)
 
     except (ValueError, TypeError, FileNotFoundError, PermissionError) as e:
         logger.error("Error calling tool %s: %s", name, str(e))
-        return [
-            TextContent(
-                type="text",
-                text=json.dumps(
-                    {"success": False, "error": f"Tool execution failed: {str(e)}"},
-                    ensure_ascii=False,
-                    indent=2,
-                ),
-            )
-        ]
+        return _respond({"success": False, "error": f"Tool execution failed: {str(e)}"})
+
+
+# Buffer size for the stdout transport; large responses leave in one write()
+STDOUT_BUFFER_SIZE = 64 * 1024
+
+
+@contextlib.contextmanager
+def _protocol_stdout() -> Iterator[Optional["anyio.AsyncFile[str]"]]:
+    """Hand stdout to the MCP transport for the life of the server
+
+    Yields a UTF-8 text stream over sys.stdout.buffer with a 64KB buffer.
+    The MCP stdio transport writes each message followed by a flush, so
+    with a buffer at least as large as typical responses every message is
+    emitted with a single write() call. While the server runs, sys.stdout
+    points at stderr so stray print() output cannot interleave with
+    protocol messages. Yields None, keeping the transport's default
+    stream, when stdout has no binary buffer.
+    """
+    stdout = sys.stdout
+    buffer = getattr(stdout, "buffer", None)
+    if buffer is None:
+        yield None
+        return
+
+    stdout.flush()
+    text = io.TextIOWrapper(
+        io.BufferedWriter(buffer, buffer_size=STDOUT_BUFFER_SIZE),
+        encoding="utf-8",
+        write_through=False,
+    )
+    try:
+        with contextlib.redirect_stdout(sys.stderr):
+            yield anyio.wrap_file(text)
+    finally:
+        # Detach rather than close, leaving sys.stdout.buffer open
+        text.detach().detach()
 
 
 async def main():
@@ -353,17 +457,35 @@ async def main():
     logger.info("Starting Excel Search MCP Server...")
 
     # Run through stdio server
-    async with stdio_server() as (read_stream, write_stream):
-        await app.run(
-            read_stream,
-            write_stream,
-            InitializationOptions(
-                server_name="excel-search-mcp",
-                server_version="0.1.0",
-                capabilities={"tools": {}},
-            ),
-        )
+    with _protocol_stdout() as stdout:
+        async with stdio_server(stdout=stdout) as (read_stream, write_stream):
+            await app.run(
+                read_stream,
+                write_stream,
+                InitializationOptions(
+                    server_name="excel-search-mcp",
+                    server_version="0.1.0",
+                    capabilities={"tools": {}},
+                ),
+            )
+
+
+def run_server() -> None:
+    """Run the server, on uvloop's libuv-based event loop when installed
+
+    uvloop lowers the cost of each await and of the stdio reads/writes; the
+    stock asyncio loop is used when it is unavailable (e.g. on Windows).
+    uvloop.run creates the loop directly instead of installing a global
+    event loop policy, which is deprecated from Python 3.12.
+    """
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+        return
+    logger.info("Using uvloop event loop")
+    uvloop.run(main())
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run_server()
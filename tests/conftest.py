@@ -0,0 +1,37 @@
+"""
+공용 테스트 fixture
+"""
+
+import pytest
+
+from src.file_scanner import list_excel_files
+
+
+@pytest.fixture(scope="session")
+def sample_scan():
+    """sample 디렉토리 스캔 결과 (세션의 테스트들이 공유하며 수정하지 않음)"""
+    return list_excel_files("sample")
+
+
+@pytest.fixture
+def make_workbook(tmp_path):
+    """tmp_path에 xlsx 워크북을 저장하고 경로를 돌려주는 함수
+
+    rows는 첫 시트에 추가할 행들, sheets는 뒤에 만들 빈 시트 이름들이다.
+    같은 이름으로 다시 호출하면 파일을 덮어쓴다.
+    """
+    import openpyxl
+
+    def make(name, rows=(), title=None, sheets=()):
+        workbook = openpyxl.Workbook()
+        if title is not None:
+            workbook.active.title = title
+        for row in rows:
+            workbook.active.append(row)
+        for sheet_name in sheets:
+            workbook.create_sheet(sheet_name)
+        file_path = tmp_path / name
+        workbook.save(file_path)
+        return str(file_path)
+
+    return make
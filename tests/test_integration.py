@@ -7,13 +7,13 @@ Integration Tests
 
 import pytest
 from pathlib import Path
-import tempfile
-import os
 import shutil
 
 from src.file_scanner import FileScanner, list_excel_files
 from src.excel_processor import ExcelProcessor, get_excel_summary
 
+SAMPLE_DIR = Path("sample")
+
 
 class TestFileScannerExcelProcessorIntegration:
     """FileScanner와 ExcelProcessor 통합 테스트"""
@@ -22,16 +22,16 @@ class TestFileScannerExcelProcessorIntegration:
         """테스트 설정"""
         self.scanner = FileScanner()
         self.processor = ExcelProcessor()
-        self.sample_dir = Path("sample")
+        self.sample_dir = SAMPLE_DIR
 
         # sample 디렉토리가 존재하는지 확인
         if not self.sample_dir.exists():
             pytest.skip("sample 디렉토리가 존재하지 않습니다.")
 
-    def test_scan_and_process_real_excel_files(self):
+    def test_scan_and_process_real_excel_files(self, sample_scan):
         """실제 Excel 파일들을 스캔하고 처리하는 통합 테스트"""
         # 1. sample 디렉토리에서 Excel 파일들 스캔
-        scan_result = list_excel_files(str(self.sample_dir))
+        scan_result = sample_scan
 
         # 스캔 결과 검증
         assert scan_result["success"] is True
@@ -80,10 +80,10 @@ class TestFileScannerExcelProcessorIntegration:
                 assert summary_result["success"] is True
                 assert "2020" in Path(file_path).name
 
-    def test_scan_and_search_content(self):
+    def test_scan_and_search_content(self, sample_scan):
         """파일을 스캔하고 내용을 검색하는 통합 테스트"""
         # 1. sample 디렉토리에서 Excel 파일들 스캔
-        scan_result = list_excel_files(str(self.sample_dir))
+        scan_result = sample_scan
 
         if scan_result["success"] and len(scan_result["files"]) > 0:
             # 2. 첫 번째 파일 선택
@@ -103,7 +103,7 @@ class TestFileScannerExcelProcessorIntegration:
                 assert "search_term" in search_result
                 assert search_result["search_term"] == term
 
-    def test_error_handling_integration(self):
+    def test_error_handling_integration(self, tmp_path):
         """에러 처리 통합 테스트"""
         # 1. 존재하지 않는 디렉토리 스캔
         invalid_scan = list_excel_files("/nonexistent/directory")
@@ -114,21 +114,17 @@ class TestFileScannerExcelProcessorIntegration:
         assert invalid_file["success"] is False
 
         # 3. 잘못된 파일 형식 처리
-        with tempfile.NamedTemporaryFile(suffix=".txt", delete=False) as tmp_file:
-            tmp_path = tmp_file.name
-            tmp_file.write(b"not an excel file")
-
-        try:
-            invalid_format = get_excel_summary(tmp_path)
-            # Excel이 아닌 파일은 처리 실패해야 함
-            assert invalid_format["success"] is False
-        finally:
-            os.unlink(tmp_path)
-
-    def test_workflow_complete_integration(self):
+        text_file = tmp_path / "not_excel.txt"
+        text_file.write_bytes(b"not an excel file")
+
+        invalid_format = get_excel_summary(str(text_file))
+        # Excel이 아닌 파일은 처리 실패해야 함
+        assert invalid_format["success"] is False
+
+    def test_workflow_complete_integration(self, sample_scan):
         """완전한 워크플로우 통합 테스트"""
         # 1. 디렉토리 스캔
-        scan_result = list_excel_files(str(self.sample_dir))
+        scan_result = sample_scan
 
         if not scan_result["success"] or len(scan_result["files"]) == 0:
             pytest.skip("처리할 Excel 파일이 없습니다.")
@@ -156,10 +152,10 @@ class TestFileScannerExcelProcessorIntegration:
                 sample_data = sheet_data["rows"][:5]  # 처음 5행만
                 assert len(sample_data) > 0
 
-    def test_large_file_handling(self):
+    def test_large_file_handling(self, sample_scan):
         """큰 파일 처리 테스트"""
         # sample 디렉토리에서 가장 큰 파일 찾기
-        scan_result = list_excel_files(str(self.sample_dir))
+        scan_result = sample_scan
 
         if not scan_result["success"] or len(scan_result["files"]) == 0:
             pytest.skip("처리할 Excel 파일이 없습니다.")
@@ -188,11 +184,11 @@ class TestDataConsistencyIntegration:
         """테스트 설정"""
         self.scanner = FileScanner()
         self.processor = ExcelProcessor()
-        self.sample_dir = Path("sample")
+        self.sample_dir = SAMPLE_DIR
 
-    def test_file_metadata_consistency(self):
+    def test_file_metadata_consistency(self, sample_scan):
         """파일 메타데이터 일관성 테스트"""
-        scan_result = list_excel_files(str(self.sample_dir))
+        scan_result = sample_scan
 
         if not scan_result["success"]:
             pytest.skip("파일 스캔에 실패했습니다.")
@@ -215,9 +211,9 @@ class TestDataConsistencyIntegration:
                 assert scanner_size == processor_size, f"파일 크기 불일치: {file_path}"
                 assert scanner_name == processor_name, f"파일 이름 불일치: {file_path}"
 
-    def test_sheet_count_consistency(self):
+    def test_sheet_count_consistency(self, sample_scan):
         """시트 개수 일관성 테스트"""
-        scan_result = list_excel_files(str(self.sample_dir))
+        scan_result = sample_scan
 
         if not scan_result["success"]:
             pytest.skip("파일 스캔에 실패했습니다.")
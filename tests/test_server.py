@@ -9,6 +9,7 @@ import pytest
 from unittest.mock import patch, MagicMock
 
 from src.server import (
+    _to_text,
     call_tool,
     get_multiple_excel_summaries,
     list_tools,
@@ -40,6 +41,11 @@ class TestMCPServer:
             assert tool.inputSchema["type"] == "object"
             assert "properties" in tool.inputSchema
 
+    @pytest.mark.asyncio
+    async def test_list_tools_built_once(self):
+        """Test that the tool definitions are shared between calls"""
+        assert await list_tools() is await list_tools()
+
     @pytest.mark.asyncio
     @patch("src.server.list_excel_files")
     async def test_call_tool_list_excel_files(self, mock_list_excel_files):
@@ -318,6 +324,133 @@ class TestMCPServer:
         assert data["success"] is False
         assert "required" in data["error"]
 
+    @pytest.mark.asyncio
+    @patch("src.excel_processor.get_excel_summary")
+    async def test_get_multiple_excel_summaries_duplicates(
+        self, mock_get_excel_summary
+    ):
+        """Test that duplicate paths are summarized once, keeping input order"""
+        mock_get_excel_summary.side_effect = lambda path: {
+            "success": True,
+            "file_path": path,
+        }
+
+        result = await get_multiple_excel_summaries(
+            ["/test/a.xlsx", "/test/b.xlsx", "/test/a.xlsx"]
+        )
+
+        assert mock_get_excel_summary.call_count == 2
+        assert result["total_files"] == 3
+        assert [summary["file_path"] for summary in result["summaries"]] == [
+            "/test/a.xlsx",
+            "/test/b.xlsx",
+            "/test/a.xlsx",
+        ]
+
+    @pytest.mark.asyncio
+    @patch("src.excel_processor.get_excel_summary")
+    async def test_get_multiple_excel_summaries_errors(self, mock_get_excel_summary):
+        """Test that a file whose summary raises is reported under errors"""
+
+        def summarize(path):
+            if path == "/test/bad.xlsx":
+                raise OSError("disk error")
+            return {"success": True, "file_path": path}
+
+        mock_get_excel_summary.side_effect = summarize
+
+        result = await get_multiple_excel_summaries(["/test/a.xlsx", "/test/bad.xlsx"])
+
+        assert result["successful_files"] == 1
+        assert result["failed_files"] == 1
+        assert result["summaries"] == [{"success": True, "file_path": "/test/a.xlsx"}]
+        assert result["errors"] == [
+            {"file_path": "/test/bad.xlsx", "error": "disk error"}
+        ]
+
+    def test_to_text_dates(self):
+        """Test that date values in results are encoded as ISO strings"""
+        from datetime import datetime
+        import pandas as pd
+
+        content = _to_text(
+            {"date": datetime(2020, 1, 2), "timestamp": pd.Timestamp("2020-01-03")}
+        )
+
+        assert json.loads(content.text) == {
+            "date": "2020-01-02T00:00:00",
+            "timestamp": "2020-01-03T00:00:00",
+        }
+
+    def test_to_text_same_without_orjson(self, monkeypatch):
+        """Test that numpy and NaN values are encoded alike without orjson"""
+        import numpy as np
+        import pandas as pd
+        from src import server
+
+        pytest.importorskip("orjson")
+        obj = {
+            "count": np.int64(3),
+            "values": [float("nan"), np.float64(1.5), pd.NaT],
+            "timestamp": pd.Timestamp("2020-01-02 03:04:05.123456"),
+        }
+
+        with_orjson = _to_text(obj).text
+        monkeypatch.setattr(server, "orjson", None)
+
+        assert _to_text(obj).text == with_orjson
+        assert json.loads(with_orjson) == {
+            "count": 3,
+            "values": [None, 1.5, None],
+            "timestamp": "2020-01-02T03:04:05.123456",
+        }
+
+    def test_respond_structured_content(self, monkeypatch):
+        """Test that structured results also carry the JSON text"""
+        import numpy as np
+        import pandas as pd
+        from src import server
+        from src.config_manager import config_manager
+
+        if not server._STRUCTURED_CONTENT_SUPPORTED:
+            pytest.skip("installed mcp package has no structuredContent")
+        monkeypatch.setattr(config_manager, "_structured_content", True)
+
+        result = server._respond(
+            {
+                "success": True,
+                "count": np.int64(3),
+                "timestamp": pd.Timestamp("2020-01-03"),
+            }
+        )
+
+        expected = {"success": True, "count": 3, "timestamp": "2020-01-03T00:00:00"}
+        assert result.structuredContent == expected
+        assert json.loads(result.content[0].text) == expected
+        assert result.isError is False
+
+    def test_protocol_stdout_redirects_print(self, monkeypatch):
+        """Test that protocol output shares stdout's buffer and print goes to stderr"""
+        import io
+        import sys
+        from src.server import _protocol_stdout
+
+        raw = io.BytesIO()
+        stdout = io.TextIOWrapper(raw, encoding="utf-8")
+        stderr = io.StringIO()
+        monkeypatch.setattr(sys, "stdout", stdout)
+        monkeypatch.setattr(sys, "stderr", stderr)
+
+        with _protocol_stdout() as stream:
+            print("stray")
+            stream.wrapped.write('{"jsonrpc": "2.0"}\n')
+            stream.wrapped.flush()
+            assert raw.getvalue() == b'{"jsonrpc": "2.0"}\n'
+
+        assert stderr.getvalue() == "stray\n"
+        assert sys.stdout is stdout
+        assert not stdout.closed
+
 
 if __name__ == "__main__":
     pytest.main([__file__])
@@ -6,12 +6,44 @@ Simple tests for actually implemented functionality.
 
 import pytest
 from pathlib import Path
-import tempfile
+import json
 import os
+from datetime import datetime
+
+import numpy as np
 
 from src.file_scanner import FileScanner, list_excel_files
-from src.excel_processor import ExcelProcessor, get_excel_summary
-from src.data_formatter import DataFormatter
+from src.excel_processor import ExcelProcessor, WorkbookHandle, get_excel_summary
+from src.data_formatter import DataFormatter, format_timestamp
+from src.config_manager import ConfigManager
+
+
+class TestConfigManager:
+    """Config manager tests"""
+
+    def test_is_path_within_work_directory(self, tmp_path):
+        """Test work directory path check"""
+        tmp_dir = str(tmp_path)
+        work_dir = os.path.join(tmp_dir, "work")
+        os.makedirs(work_dir)
+        config_path = os.path.join(tmp_dir, "config.json")
+        with open(config_path, "w", encoding="utf-8") as f:
+            f.write('{"work_directory": %s}' % json.dumps(work_dir))
+
+        manager = ConfigManager(config_path)
+
+        # Inside work directory
+        assert manager.is_path_within_work_directory(work_dir) is True
+        assert (
+            manager.is_path_within_work_directory(
+                os.path.join(work_dir, "sub", "file.xlsx")
+            )
+            is True
+        )
+
+        # Outside work directory (including sibling with same prefix)
+        assert manager.is_path_within_work_directory(tmp_dir) is False
+        assert manager.is_path_within_work_directory(work_dir + "2") is False
 
 
 class TestFileScanner:
@@ -37,6 +69,44 @@ class TestFileScanner:
         assert scanner.is_excel_file(Path("test.pdf")) is False
         assert scanner.is_excel_file(Path("test.docx")) is False
 
+    def test_find_excel_files_by_name_contains(self, tmp_path):
+        """Test "*text*" patterns against general glob patterns"""
+        scanner = FileScanner()
+        for name in ("a_2020.xlsx", "b_2021.xlsx", "2020.txt", "x2020y.xls"):
+            (tmp_path / name).touch()
+
+        def names(pattern):
+            result = scanner.find_excel_files_by_name(str(tmp_path), pattern)
+            return sorted(f["file_name"] for f in result["files"])
+
+        assert names("*2020*") == ["a_2020.xlsx", "x2020y.xls"]
+        assert names("*20[2]0*") == ["a_2020.xlsx", "x2020y.xls"]
+        assert names("*_20?1*") == ["b_2021.xlsx"]
+
+    def test_list_excel_files_cache_invalidation(self, tmp_path, monkeypatch):
+        """Test that cached listings see changes in nested directories"""
+        from src.config_manager import config_manager
+
+        work_dir = os.path.normcase(os.path.realpath(tmp_path))
+        monkeypatch.setattr(config_manager, "_work_dir_resolved", work_dir)
+        monkeypatch.setattr(config_manager, "_work_dir_prefix", work_dir + os.sep)
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "sub" / "a.xlsx").touch()
+
+        result = list_excel_files(str(tmp_path))
+        assert result["total_files"] == 1
+
+        # Callers cannot change the cached listing
+        result["files"][0]["file_name"] = "changed"
+        result["files"].clear()
+        again = list_excel_files(os.path.join(str(tmp_path), "sub", ".."))
+        assert [f["file_name"] for f in again["files"]] == ["a.xlsx"]
+
+        # A file added below the top directory invalidates the listing
+        (tmp_path / "sub" / "b.xlsx").touch()
+        result = list_excel_files(str(tmp_path))
+        assert sorted(f["file_name"] for f in result["files"]) == ["a.xlsx", "b.xlsx"]
+
     def test_scan_nonexistent_directory(self):
         """Test scanning non-existent directory"""
         result = list_excel_files("/nonexistent/directory")
@@ -45,20 +115,17 @@ class TestFileScanner:
         assert "error" in result
         assert "does not exist" in result["error"]
 
-    def test_scan_file_instead_of_directory(self):
+    def test_scan_file_instead_of_directory(self, tmp_path):
         """Test scanning file as directory"""
         # Create temporary file
-        with tempfile.NamedTemporaryFile(suffix=".txt", delete=False) as tmp_file:
-            tmp_path = tmp_file.name
+        file_path = tmp_path / "not_a_directory.txt"
+        file_path.write_bytes(b"")
 
-        try:
-            result = list_excel_files(tmp_path)
+        result = list_excel_files(str(file_path))
 
-            assert result["success"] is False
-            assert "error" in result
-            assert "not a directory" in result["error"]
-        finally:
-            os.unlink(tmp_path)
+        assert result["success"] is False
+        assert "error" in result
+        assert "not a directory" in result["error"]
 
 
 class TestExcelProcessor:
@@ -90,10 +157,321 @@ class TestExcelProcessor:
         assert result["success"] is False
         assert "error" in result
 
+    def test_get_excel_summaries_keeps_order(self):
+        """Test that summaries of several files come back in input order"""
+        from src.excel_processor import get_excel_summaries
+
+        paths = ["/nonexistent/a.xlsx", "/nonexistent/b.xlsx", "/nonexistent/a.xlsx"]
+        summaries = get_excel_summaries(paths)
+
+        assert [summary["success"] for summary in summaries] == [False] * 3
+        assert [summary["file_path"] for summary in summaries] == paths
+        assert get_excel_summaries([]) == []
+
+    def test_workbook_handle(self, make_workbook):
+        """Test worksheet structure read through WorkbookHandle"""
+        file_path = make_workbook(
+            "book.xlsx", [["name", "value"], ["a", 1]], title="First", sheets=["Second"]
+        )
+
+        with WorkbookHandle(file_path) as handle:
+            assert handle.sheetnames == ["First", "Second"]
+            first = handle.worksheets[0]
+            assert first["row_count"] == 2
+            assert first["headers"] == ["name", "value"]
+
+            # Sizes read from the package match the openpyxl summary
+            sizes = handle.sheet_sizes
+            assert [size["name"] for size in sizes] == ["First", "Second"]
+            assert sizes[0]["row_count"] == 2
+            assert sizes[0]["column_count"] == 2
+            assert sizes[1]["has_data"] is False
+
+        summary = ExcelProcessor().get_worksheet_summary(Path(file_path))
+        assert summary["success"] is True
+        assert summary["total_worksheets"] == 2
+
+    def test_sheet_sizes_skip_openpyxl(self, make_workbook, monkeypatch):
+        """Test that sheet sizes come from the package, without openpyxl"""
+        from src import excel_processor
+
+        file_path = make_workbook(
+            "sizes.xlsx", [["a", "b", "c"], [1, 2, 3]], sheets=["Empty"]
+        )
+
+        monkeypatch.setattr(
+            excel_processor,
+            "_open_workbook",
+            lambda *args: pytest.fail("workbook loaded with openpyxl"),
+        )
+        with WorkbookHandle(file_path) as handle:
+            sizes = handle.sheet_sizes
+
+        assert [size["name"] for size in sizes] == ["Sheet", "Empty"]
+        assert sizes[0]["row_count"] == 2
+        assert sizes[0]["column_count"] == 3
+        assert sizes[0]["has_data"] is True
+        assert sizes[1]["has_data"] is False
+
+    def test_invalid_format_detected_by_signature(self, tmp_path):
+        """Test that non-workbook content is rejected before parsing"""
+        file_path = tmp_path / "not_excel.xlsx"
+        file_path.write_text("name,value\n1,2\n")
+
+        result = ExcelProcessor().get_worksheet_summary(str(file_path))
+
+        assert result["success"] is False
+        assert result["error_code"] == "INVALID_FORMAT"
+
+    def test_summary_disk_cache(self, make_workbook, tmp_path, monkeypatch):
+        """Test that sheet summaries are persisted per file version"""
+        from src.config_manager import config_manager
+        from src.excel_processor import _workbook_summary_cached
+
+        cache_dir = str(tmp_path / "cache")
+        monkeypatch.setattr(config_manager, "_summary_cache_dir", cache_dir)
+
+        file_path = make_workbook("book.xlsx", [["name", 1.5]])
+        stat = os.stat(file_path)
+
+        summary = _workbook_summary_cached.__wrapped__(
+            file_path, stat.st_mtime_ns, stat.st_size
+        )
+        assert len(os.listdir(cache_dir)) == 1
+
+        # A second parse is served from disk with identical content
+        monkeypatch.setattr(
+            "src.excel_processor._summarize_workbook",
+            lambda *args: pytest.fail("workbook reparsed"),
+        )
+        cached = _workbook_summary_cached.__wrapped__(
+            file_path, stat.st_mtime_ns, stat.st_size
+        )
+        assert cached == summary
+
+    def test_calamine_sheet_sizes_xls(self):
+        """Test that xls sheet sizes are measured with python-calamine"""
+        pytest.importorskip("python_calamine")
+        from src.excel_processor import _calamine_sheet_sizes_cached
+
+        file_path = os.path.abspath(os.path.join("sample", "Vegetables.xls"))
+        if not os.path.exists(file_path):
+            pytest.skip("sample/Vegetables.xls is not available")
+        stat = os.stat(file_path)
+
+        sizes = _calamine_sheet_sizes_cached(file_path, stat.st_mtime_ns, stat.st_size)
+        assert sizes is not None
+        assert [size["index"] for size in sizes] == list(range(len(sizes)))
+        assert all(size["row_count"] >= 1 for size in sizes)
+
+    def test_calamine_worksheet_summary_xls(self):
+        """Test that xls worksheets are summarized with python-calamine"""
+        pytest.importorskip("python_calamine")
+
+        file_path = os.path.join("sample", "Vegetables.xls")
+        if not os.path.exists(file_path):
+            pytest.skip("sample/Vegetables.xls is not available")
+
+        result = ExcelProcessor().get_worksheet_summary(file_path)
+
+        assert result["success"] is True
+        assert result["total_worksheets"] == len(result["worksheets"])
+        assert any(worksheet["headers"] for worksheet in result["worksheets"])
+
+    def test_workbooks_open_read_only(self, make_workbook):
+        """Test that workbooks are streamed in read-only, values-only mode"""
+        from openpyxl.worksheet._read_only import ReadOnlyWorksheet
+        from src.excel_processor import _open_workbook
+
+        file_path = make_workbook("book.xlsx", [[1, 2, "=A1+B1"]])
+
+        workbook = _open_workbook(file_path)
+        try:
+            assert workbook.read_only is True
+            assert workbook.data_only is True
+            assert isinstance(workbook.active, ReadOnlyWorksheet)
+        finally:
+            workbook.close()
+
+    def test_read_worksheet_data_max_rows(self, make_workbook):
+        """Test that reading stops after max_rows data rows"""
+        rows = [[i, None if i % 2 else i * 1.5] for i in range(100)]
+        file_path = make_workbook("rows.xlsx", [["id", "value"], *rows])
+
+        result = ExcelProcessor().read_worksheet_data(Path(file_path), max_rows=3)
+
+        assert result["success"] is True
+        assert result["headers"] == ["id", "value"]
+        assert result["rows"] == [[0, 0.0], [1, None], [2, 3.0]]
+        assert result["row_count"] == 3
+
+        result = ExcelProcessor().read_worksheet_data(
+            file_path, max_rows=3, columnar=True
+        )
+
+        assert "rows" not in result
+        assert result["columns"] == [[0, 1, 2], [0.0, None, 3.0]]
+        assert result["row_count"] == 3
+
+    def test_read_worksheet_data_dates(self, make_workbook):
+        """Test that date and time cells are returned as ISO strings"""
+        from datetime import time
+
+        file_path = make_workbook(
+            "dates.xlsx",
+            [
+                ["date", "time", "n"],
+                [datetime(2020, 1, 2), time(6, 42), 1],
+                [None, None, 2],
+            ],
+        )
+
+        result = ExcelProcessor().read_worksheet_data(Path(file_path))
+
+        assert result["success"] is True
+        assert result["rows"] == [
+            ["2020-01-02T00:00:00", "06:42:00", 1],
+            [None, None, 2],
+        ]
+        json.dumps(result)
+
+    def test_repeated_searches_read_sheet_once(self, make_workbook, monkeypatch):
+        """Test that consecutive searches in one file reuse the sheet read"""
+        from src import data_formatter
+
+        rows = [["name", "note"], ["total", "sum of values"]]
+        file_path = make_workbook("search.xlsx", rows)
+
+        reads = []
+        read_sheet_fast = data_formatter.read_sheet_fast
+        monkeypatch.setattr(
+            data_formatter,
+            "read_sheet_fast",
+            lambda *args: reads.append(args) or read_sheet_fast(*args),
+        )
+
+        processor = ExcelProcessor()
+        for term in ["total", "sum", "value"]:
+            result = processor.search_in_worksheet(Path(file_path), term)
+            assert result["total_matches"] == 1
+        assert len(reads) == 1
+
+        # The cache is shared by processors, not kept per instance
+        result = ExcelProcessor().search_in_worksheet(
+            file_path, "TOTAL", case_sensitive=True
+        )
+        assert result["total_matches"] == 0
+        assert len(reads) == 1
+
+        # An edited file is read again
+        make_workbook("search.xlsx", [*rows, ["value", ""]])
+        result = processor.search_in_worksheet(Path(file_path), "value")
+        assert result["total_matches"] == 2
+        assert len(reads) == 2
+
 
 class TestDataFormatter:
     """Data formatter tests"""
 
+    def test_format_excel_data_short_sheet_read_once(self, make_workbook, monkeypatch):
+        """Test that a sheet shorter than max_rows is read only once"""
+        from src import data_formatter
+
+        rows = [[i, i * 2] for i in range(5)]
+        file_path = make_workbook("short.xlsx", [["id", "value"], *rows])
+
+        calls = []
+        read_sheet_fast = data_formatter.read_sheet_fast
+
+        def counting_read(*args, **kwargs):
+            calls.append(args)
+            return read_sheet_fast(*args, **kwargs)
+
+        monkeypatch.setattr(data_formatter, "read_sheet_fast", counting_read)
+        data_formatter._read_excel_cached.cache_clear()
+
+        for data_only in (True, False):
+            result = DataFormatter().format_excel_data(
+                file_path, max_rows=100, data_only=data_only
+            )
+            assert result["success"] is True
+            assert result["data"]["row_count"] == 5
+
+        assert len(calls) == 1
+
+    def test_full_sheet_reads_bounded(self, make_workbook):
+        """Test that full sheet reads keep only SHEET_CACHE_SIZE frames"""
+        from src import data_formatter
+
+        formatter = DataFormatter()
+        formatter.clear_cache()
+        file_count = data_formatter.SHEET_CACHE_SIZE + 2
+        for i in range(file_count):
+            file_path = make_workbook(f"book{i}.xlsx", [["n"], [i]])
+            assert formatter.read_dataframe(file_path)["n"].tolist() == [i]
+            formatter.read_dataframe(file_path, nrows=5)
+
+        full_reads = data_formatter._read_sheet_full_cached.cache_info()
+        assert full_reads.currsize == data_formatter.SHEET_CACHE_SIZE
+        assert data_formatter._read_excel_cached.cache_info().currsize == file_count
+
+    def test_format_excel_data_keeps_columns_filled_below_max_rows(self, make_workbook):
+        """Test that max_rows does not drop columns with values further down"""
+        rows = [[i, None if i < 5 else i * 2, None] for i in range(10)]
+        file_path = make_workbook("sparse.xlsx", [["a", "b", "c"], *rows])
+
+        result = DataFormatter().format_excel_data(file_path, max_rows=3)
+
+        assert result["success"] is True
+        assert result["data"]["headers"] == ["a", "b"]
+        assert result["data"]["rows"] == [[0, None], [1, None], [2, None]]
+
+    def test_format_dataframe_columnar_duplicate_headers(self):
+        """Test that columnar output keeps columns with duplicate headers"""
+        import pandas as pd
+
+        df = pd.DataFrame([[1, "x"], [2, None]], columns=["a", "a"])
+        result = DataFormatter().format_dataframe(df, columnar=True)
+
+        assert result["headers"] == ["a", "a"]
+        assert result["columns"] == [[1, 2], ["x", None]]
+        assert result["row_count"] == 2
+
+    def test_format_series_datetimes_match_isoformat(self):
+        """Test that datetime columns keep microseconds and UTC offsets"""
+        import pandas as pd
+
+        formatter = DataFormatter()
+        values = [
+            pd.Timestamp("2020-01-02 03:04:05.123456"),
+            pd.Timestamp("2020-01-02"),
+            pd.NaT,
+        ]
+        for series in (pd.Series(values), pd.Series(values).dt.tz_localize("UTC")):
+            expected = [
+                None if value is pd.NaT else formatter.format_value(value)
+                for value in series.tolist()
+            ]
+            assert formatter.format_series(series) == expected
+
+        assert formatter.format_series(pd.Series(values))[:2] == [
+            "2020-01-02T03:04:05.123456",
+            "2020-01-02T00:00:00",
+        ]
+
+    def test_format_value_time(self):
+        """Test that time-of-day cells are formatted as ISO 8601"""
+        from datetime import time
+
+        import pandas as pd
+
+        formatter = DataFormatter()
+        assert formatter.format_value(time(9, 30)) == "09:30:00"
+        assert formatter.format_value(time(9, 30, 15, 250)) == "09:30:15.000250"
+
+        series = pd.Series([time(23, 59, 59), None], dtype=object)
+        assert formatter.format_series(series) == ["23:59:59", None]
+
     def test_data_formatter_initialization(self):
         """Test DataFormatter initialization"""
         formatter = DataFormatter()
@@ -113,6 +491,65 @@ class TestDataFormatter:
         assert formatter.format_value(123) == 123
         assert formatter.format_value(123.45) == 123.45
 
+        # NaN values
+        assert formatter.format_value(float("nan")) is None
+        assert formatter.format_value(np.float64("nan")) is None
+
+        # Numpy and datetime values
+        assert formatter.format_value(np.int64(7)) == 7
+        assert formatter.format_value(datetime(2024, 1, 2, 3, 4, 5)) == (
+            "2024-01-02T03:04:05"
+        )
+        assert formatter.format_value(np.array([1, 2])) == [1, 2]
+
+    def test_format_timestamp(self):
+        """Test UTC timestamp formatting"""
+        assert format_timestamp(0) == "1970-01-01T00:00:00Z"
+        assert format_timestamp(1700000000.7) == "2023-11-14T22:13:20Z"
+
+    @pytest.mark.parametrize("indent", [None, 0, 2])
+    def test_export_to_json_same_without_orjson(self, indent, tmp_path, monkeypatch):
+        """Test that numpy, pandas and NaN values export alike without orjson"""
+        from datetime import date, time
+
+        import pandas as pd
+        from src import data_formatter
+
+        pytest.importorskip("orjson")
+        data = {
+            "count": np.int64(3),
+            "ratio": np.float64(0.5),
+            "missing": [float("nan"), np.float64("nan"), float("inf"), pd.NaT],
+            "timestamp": pd.Timestamp("2020-01-02 03:04:05.123456"),
+            "utc": pd.Timestamp("2020-01-02", tz="UTC"),
+            "date": date(2020, 1, 2),
+            "time": time(6, 42),
+            "array": np.array([1.5, np.nan]),
+        }
+        expected = {
+            "count": 3,
+            "ratio": 0.5,
+            "missing": [None, None, None, None],
+            "timestamp": "2020-01-02T03:04:05.123456",
+            "utc": "2020-01-02T00:00:00+00:00",
+            "date": "2020-01-02",
+            "time": "06:42:00",
+            "array": [1.5, None],
+        }
+
+        formatter = DataFormatter()
+        with_orjson = formatter.export_to_json(data, indent=indent)
+        formatter.export_to_json(data, str(tmp_path / "orjson.json"), indent=indent)
+        monkeypatch.setattr(data_formatter, "orjson", None)
+        without_orjson = formatter.export_to_json(data, indent=indent)
+        formatter.export_to_json(data, str(tmp_path / "json.json"), indent=indent)
+
+        assert json.loads(with_orjson["json_data"]) == expected
+        assert without_orjson["json_data"] == with_orjson["json_data"]
+        assert (tmp_path / "json.json").read_bytes() == (
+            tmp_path / "orjson.json"
+        ).read_bytes()
+
 
 if __name__ == "__main__":
     pytest.main([__file__])